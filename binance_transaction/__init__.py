@@ -1,12 +1,17 @@
-from .bech32 import bech32_encode, address_bytes
+from .bech32 import (
+    bech32_encode, bech32_encode_many, address_bytes, address_str, address_cache_info, address_cache_clear,
+    validate_address, validate_addresses
+)
 from .base import Amino, Repeated, String, Address, StringVarInt, StringToken, Token, VarInt, make_prefix
-from .crypto import uncompress_key, compress_key, verify_sig
-from .bnb_transaction import BnbTransaction, TestBnbTransaction
+from .crypto import uncompress_key, compress_key, verify_sig, public_key_address, public_key_addresses
+from .bnb_transaction import BnbTransaction, TestBnbTransaction, sign_many
 from .dex import DexList, NewOrder, CancelOrder, BUY, SELL, GTE, IOC, LIMIT_ORDER
 from .gov import Proposal, Vote
 from .token import Send, Issue, Mint, Burn, Freeze, Unfreeze, TimeLock, TimeUnlock, TimeRelock
 from .msg import Msg
 from .signature import BnbSignature, PubKeySecp256k1
+from .factory import AccountTxFactory
+from .orders import OrderRegistry, OrderTemplate
 
 
 name = "binance_transaction"
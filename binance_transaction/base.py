@@ -1,6 +1,12 @@
 import base64
+import functools
+import weakref
 
-from binance_transaction.bech32 import bech32_encode, address_bytes
+from binance_transaction.bech32 import address_bytes, address_str
+from binance_transaction.canonical import write_mapping, write_value
+from binance_transaction.schema import Field, compile_schema
+from binance_transaction.varint import read_varint, varint_bytes, varint_size, write_varint
+from binance_transaction.wire import read_field, read_length, read_string
 
 
 """
@@ -9,8 +15,11 @@ base.py
 Base components for transaction encoding
 Includes amino and its primitive types
 
+* Tracked
 * Amino
+* as_repeated
 * make_prefix
+* read_repeated
 * VarInt
 * Bool
 * Repeated
@@ -26,19 +35,180 @@ Includes amino and its primitive types
 """
 
 
-class Amino(dict):
+class Tracked(object):
+    """
+    Encode cache bookkeeping shared by Amino and Repeated
+    Registered messages keep their encoded body in _encoded and their canonical JSON in _json
+    Containers learn their parents when encoded, so a mutation anywhere below clears every cache above it
+    """
+    __slots__ = ()
+    _encoded = None
+    _json = None
+    _parents = ()
+
+    def _adopt(self, parent):
+        for ref in self._parents:
+            if ref() is parent:
+                return
+        # drop parents that are gone, such as transactions a reused message was sent in
+        self._parents = tuple(ref for ref in self._parents if ref() is not None) + (weakref.ref(parent),)
+
+    def _invalidate(self):
+        if self._encoded is not None:
+            self._encoded = None
+        if self._json is not None:
+            self._json = None
+        for ref in self._parents:
+            parent = ref()
+            if parent is not None:
+                parent._invalidate()
+
+    def __getstate__(self):
+        # weak references cannot be pickled, and copies start with an empty cache
+        state = dict(self.__dict__)
+        state.pop('_encoded', None)
+        state.pop('_json', None)
+        state.pop('_parents', None)
+        return state
+
+
+def invalidating(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._invalidate()
+        return result
+    return wrapper
+
+
+class Amino(Tracked, dict):
+    """
+    Messages declare their amino fields as a tuple of schema.Field
+    encode_into and read_body are compiled from that table
+    """
+    wire_type = 2
+    fields = None
+
+    def __setitem__(self, key, value):
+        if type(value) is list:
+            value = Repeated(value)
+        dict.__setitem__(self, key, value)
+        self._invalidate()
+
+    __delitem__ = invalidating(dict.__delitem__)
+    clear = invalidating(dict.clear)
+    pop = invalidating(dict.pop)
+    popitem = invalidating(dict.popitem)
+    setdefault = invalidating(dict.setdefault)
+    update = invalidating(dict.update)
+    # dict has no |= before Python 3.9
+    if hasattr(dict, '__ior__'):
+        __ior__ = invalidating(dict.__ior__)
+
+    def __init_subclass__(klass, **kwargs):
+        super(Amino, klass).__init_subclass__(**kwargs)
+        if klass.fields is not None:
+            compile_schema(klass, Repeated)
+
     def encode(self, field_id=None):
+        buf = bytearray()
+        self.encode_into(buf, field_id)
+        return bytes(buf)
+
+    def encode_into(self, buf, field_id=None):
+        """
+        Append the encoding to buf, a bytearray shared by the whole transaction
+        """
+        raise NotImplementedError
+
+    def encoded_size(self, field_id=None):
+        """
+        len(self.encode(field_id)), computed without encoding
+        """
         raise NotImplementedError
 
+    def write_json(self, parts):
+        """
+        Append canonical JSON to parts, see canonical.py
+        """
+        write_mapping(self, parts, self)
+
     @staticmethod
-    def decode(data, field_id=None):
+    def default():
+        return None
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        start, pos = read_length(data, pos, end)
+        return klass.read_body(data, start, pos, hrp), pos
+
+    @classmethod
+    def read_body(klass, data, pos, end, hrp='bnb'):
+        """
+        Decode the message occupying data[pos:end]
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def decode(klass, data, field_id=None, hrp='bnb'):
+        view = memoryview(data)
+        if field_id is None:
+            return klass.read_body(view, 0, len(view), hrp), data[len(view):]
+        value, pos = read_field(klass, view, 0, len(view), field_id, hrp)
+        return value, data[pos:]
+
+    @classmethod
+    def read_record(klass, data, pos, end, hrp='bnb'):
+        start, pos = read_length(data, pos, end)
+        return klass.read_record_body(data, start, pos, hrp), pos
+
+    @classmethod
+    def read_record_body(klass, data, pos, end, hrp='bnb'):
+        """
+        Decode the message occupying data[pos:end] as a compact klass.Record
+        """
         raise NotImplementedError
 
+    @classmethod
+    def decode_compact(klass, data, hrp='bnb'):
+        view = memoryview(data)
+        return klass.read_record_body(view, 0, len(view), hrp)
+
+
+def as_repeated(values):
+    return values if isinstance(values, Repeated) else Repeated(values)
+
 
 def make_prefix(field_id, type_id):
     return VarInt(field_id << 3 | type_id).encode()
 
 
+def read_repeated(klass, data, pos, end, field_id, hrp='bnb'):
+    prefix = field_id << 3 | klass.wire_type
+    items = []
+    while pos < end and data[pos] == prefix:
+        item, pos = klass.read(data, pos + 1, end, hrp)
+        items.append(item)
+    return Repeated(items), pos
+
+
+def length_prefixed_size(length, field_id=None):
+    if field_id is None:
+        return varint_size(length) + length
+    return varint_size(field_id << 3 | 2) + varint_size(length) + length
+
+
+def decode_value(klass, data, field_id=None, hrp='bnb'):
+    view = memoryview(data)
+    if field_id is not None:
+        value, pos = read_field(klass, view, 0, len(view), field_id, hrp)
+    elif len(view) == 0:
+        value, pos = klass.default(), 0
+    else:
+        value, pos = klass.read(view, 0, len(view), hrp)
+    return value, data[pos:]
+
+
 class VarInt(int):
     def __new__(cls, val):
         return super(VarInt, cls).__new__(cls, val)
@@ -46,80 +216,131 @@ class VarInt(int):
     def encode(self, field_id=None):
         # https://developers.google.com/protocol-buffers/docs/encoding
         # base 128
-        int_bytes = []
-        remaining = int(self)
-        if remaining == 0:
+        value = int(self)
+        if value == 0:
             return b''
-        while remaining >= 128:
-            int_bytes.append(remaining % 128 + 128)
-            remaining //= 128
-        int_bytes.append(remaining)
         if field_id is None:
-            return bytes(int_bytes)
-        else:
-            return make_prefix(field_id, 0) + bytes(int_bytes)
+            return varint_bytes(value)
+        return varint_bytes(field_id << 3) + varint_bytes(value)
 
-    @staticmethod
-    def decode(data, field_id=None):
+    def encode_into(self, buf, field_id=None):
+        value = int(self)
+        if value == 0:
+            return
         if field_id is not None:
-            prefix = make_prefix(field_id, 0)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return VarInt(0), data
-            data = data[len(prefix):]
-        amount = 0
-        if len(data) == 0:
-            return VarInt(0), data
-        mul = 1
-        for i in range(len(data)):
-            amount += (data[i] % 128) * mul
-            if data[i] < 128:
-                return VarInt(amount), data[i+1:]
-            mul *= 128
-        assert False, 'Reached end while parsing VarInt from %s' % data
+            write_varint(buf, field_id << 3)
+        write_varint(buf, value)
+
+    def encoded_size(self, field_id=None):
+        value = int(self)
+        if value == 0:
+            return 0
+        if field_id is None:
+            return varint_size(value)
+        return varint_size(field_id << 3) + varint_size(value)
+
+    wire_type = 0
+
+    @classmethod
+    def default(klass):
+        return klass(0)
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        return klass(value), pos
+
+    @classmethod
+    def decode(klass, data, field_id=None, hrp='bnb'):
+        return decode_value(klass, data, field_id, hrp)
+
+    raw_default = 0
+
+    @staticmethod
+    def read_raw(data, pos, end, hrp='bnb'):
+        return read_varint(data, pos, end)
+
+    @classmethod
+    def from_raw(klass, raw, hrp='bnb'):
+        return klass(raw)
 
 
 class Bool(VarInt):
     """
     This would subclass bool if that were possible :(
     We cannot make json.dumps print true or false otherwise so we unwrap for that
-    This class still helps with encoding and decoding.
+    This class still helps with encoding and decoding, which unwraps to bool.
     https://github.com/python/cpython/blob/master/Lib/json/encoder.py#L305
     """
     def __new__(cls, val):
         return super(Bool, cls).__new__(cls, 1 if val else 0)
 
     @staticmethod
-    def decode(data, field_id=None):
-        if field_id is not None:
-            for i in range(len(field_id)):
-                if field_id[i] != data[i]:
-                    return Bool(False), data
-            data = data[len(field_id):]
-        if len(data) == 0:
-            return Bool(False), data
-        return Bool(data[0]), data[1:]
+    def default():
+        return False
 
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        return value != 0, pos
 
-class Repeated(list):
-    def __new__(cls, values):
+    raw_default = False
+    read_raw = read
+
+    @staticmethod
+    def from_raw(raw, hrp='bnb'):
+        return raw
+
+
+class Repeated(Tracked, list):
+    def __new__(cls, values=()):
         return super(Repeated, cls).__new__(cls, values)
 
+    __setitem__ = invalidating(list.__setitem__)
+    __delitem__ = invalidating(list.__delitem__)
+    __iadd__ = invalidating(list.__iadd__)
+    __imul__ = invalidating(list.__imul__)
+    append = invalidating(list.append)
+    extend = invalidating(list.extend)
+    insert = invalidating(list.insert)
+    pop = invalidating(list.pop)
+    remove = invalidating(list.remove)
+    clear = invalidating(list.clear)
+    sort = invalidating(list.sort)
+    reverse = invalidating(list.reverse)
+
     def encode(self, field_id):
-        buf = b''
+        buf = bytearray()
+        self.encode_into(buf, field_id)
+        return bytes(buf)
+
+    def encode_into(self, buf, field_id):
+        for amino_value in self:
+            amino_value._adopt(self)
+            amino_value.encode_into(buf, field_id)
+
+    def encoded_size(self, field_id):
+        size = 0
+        for amino_value in self:
+            size += amino_value.encoded_size(field_id)
+        return size
+
+    def write_json(self, parts):
+        if not self:
+            parts.append('[]')
+            return
+        separator = '['
         for amino_value in self:
-            buf += amino_value.encode(field_id)
-        return buf
+            parts.append(separator)
+            separator = ','
+            write_value(amino_value, parts, self)
+        parts.append(']')
 
     @staticmethod
-    def decode(data, prefix, klass=None):
-        items = []
-        while True:
-            for i in range(len(prefix)):
-                if data[i] != prefix[i]:
-                    return Repeated(items), data
-            item, data = klass.decode(data, prefix)
-            items.append(item)
+    def decode(data, field_id, klass, hrp='bnb'):
+        view = memoryview(data)
+        items, pos = read_repeated(klass, view, 0, len(view), field_id, hrp)
+        return items, data[pos:]
 
 
 class RepeatedPacked(list):
@@ -143,23 +364,49 @@ class String(str):
         return super(String, cls).__new__(cls, data)
 
     def encode(self, field_id=None):
+        buf = bytearray()
+        self.encode_into(buf, field_id)
+        return bytes(buf)
+
+    def encode_into(self, buf, field_id=None):
         if self is None or len(self) == 0:
-            return b''
-        buf = VarInt(len(self)).encode() + str.encode(self, 'utf8')
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + buf
+            return
+        data = str.encode(self, 'utf8')
+        if field_id is not None:
+            write_varint(buf, field_id << 3 | 2)
+        write_varint(buf, len(data))
+        buf += data
+
+    def encoded_size(self, field_id=None):
+        if self is None or len(self) == 0:
+            return 0
+        length = len(self) if self.isascii() else len(str.encode(self, 'utf8'))
+        return length_prefixed_size(length, field_id)
+
+    wire_type = 2
+
+    @classmethod
+    def default(klass):
+        return klass('')
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        value, pos = read_string(data, pos, end)
+        return klass(value), pos
+
+    @classmethod
+    def decode(klass, data, field_id=None, hrp='bnb'):
+        return decode_value(klass, data, field_id, hrp)
+
+    raw_default = ''
 
     @staticmethod
-    def decode(data, field_id=None):
-        if field_id is not None:
-            for i in range(len(field_id)):
-                if field_id[i] != data[i]:
-                    return String(''), data
-            data = data[len(field_id):]
-        length, data = VarInt.decode(data)
-        return String(data[0:length].decode('utf8')), data[length:]
+    def read_raw(data, pos, end, hrp='bnb'):
+        return read_string(data, pos, end)
+
+    @classmethod
+    def from_raw(klass, raw, hrp='bnb'):
+        return klass(raw)
 
 
 class StringVarInt(String):
@@ -170,82 +417,114 @@ class StringVarInt(String):
     def encode(self, field_id=None):
         return VarInt.encode(int(self), field_id)
 
-    def decode(data, field_id=None):
-        varint, data = VarInt.decode(data, field_id)
-        return StringVarInt(str(varint)), data
+    def encode_into(self, buf, field_id=None):
+        VarInt.encode_into(int(self), buf, field_id)
+
+    def encoded_size(self, field_id=None):
+        return VarInt.encoded_size(int(self), field_id)
+
+    wire_type = 0
+
+    @classmethod
+    def default(klass):
+        return klass('0')
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        return klass(str(value)), pos
+
+    raw_default = 0
+
+    @staticmethod
+    def read_raw(data, pos, end, hrp='bnb'):
+        return read_varint(data, pos, end)
+
+    @classmethod
+    def from_raw(klass, raw, hrp='bnb'):
+        return klass(str(raw))
 
 
 # json as base64 string
 class Bytes(String):
-    def encode(self, field_id=None):
+    def encode_into(self, buf, field_id=None):
         if self is None or len(self) == 0:
-            return b''
-        buf = base64.b64decode(str(self))
-        buf = VarInt(len(buf)).encode() + buf
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + buf
+            return
+        data = base64.b64decode(str(self))
+        if field_id is not None:
+            write_varint(buf, field_id << 3 | 2)
+        write_varint(buf, len(data))
+        buf += data
+
+    def encoded_size(self, field_id=None):
+        if self is None or len(self) == 0:
+            return 0
+        length = len(self) * 3 // 4 - len(self) + len(self.rstrip('='))
+        return length_prefixed_size(length, field_id)
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        start, pos = read_length(data, pos, end)
+        return klass(base64.b64encode(data[start:pos]).decode('utf8')), pos
+
+    raw_default = b''
 
     @staticmethod
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return Bytes(''), data
-            data = data[len(prefix):]
-        length, data = VarInt.decode(data)
-        return Bytes(base64.b64encode(data[0:length]).decode('utf8')), data[length:]
+    def read_raw(data, pos, end, hrp='bnb'):
+        start, pos = read_length(data, pos, end)
+        return bytes(data[start:pos]), pos
+
+    @classmethod
+    def from_raw(klass, raw, hrp='bnb'):
+        return klass(base64.b64encode(raw).decode('utf8'))
 
 
 # json as bnb1 address
 class Address(String):
-    def encode(self, field_id=None):
+    def encode_into(self, buf, field_id=None):
         if len(self) == 0:
-            return b''
-        buf = VarInt(20).encode() + address_bytes(self)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + buf
+            return
+        data = address_bytes(self)
+        if field_id is not None:
+            write_varint(buf, field_id << 3 | 2)
+        write_varint(buf, len(data))
+        buf += data
+
+    def encoded_size(self, field_id=None):
+        if len(self) == 0:
+            return 0
+        # bech32 characters after the separator carry 5 bits each, the last 6 are the checksum
+        length = (len(self) - self.rfind('1') - 7) * 5 // 8
+        return length_prefixed_size(length, field_id)
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        start, pos = read_length(data, pos, end)
+        return klass(address_str(hrp, bytes(data[start:pos]))), pos
+
+    raw_default = b''
 
     @staticmethod
-    def decode(data, field_id=None, hrp='bnb'):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return Address(''), data
-            data = data[len(prefix):]
-        length, data = VarInt.decode(data)
-        return Address(bech32_encode(hrp, data[0:length])), data[length:]
+    def read_raw(data, pos, end, hrp='bnb'):
+        start, pos = read_length(data, pos, end)
+        return bytes(data[start:pos]), pos
+
+    @classmethod
+    def from_raw(klass, raw, hrp='bnb'):
+        if len(raw) == 0:
+            return klass('')
+        return klass(address_str(hrp, raw))
 
 
 class Token(Amino):
+    fields = (
+        Field(1, 'denom', String),
+        Field(2, 'amount', VarInt),
+    )
+
     def __init__(self, amount, denom):
         dict.__init__(self, amount=VarInt(amount), denom=denom)
 
-    def encode(self, field_id=None):
-        buf = String(self['denom']).encode(1)
-        buf += VarInt(self['amount']).encode(2)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    @staticmethod
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return Address(''), data
-            data = data[len(field_id):]
-        denom, data = String(data, 1)
-        amount, data = VarInt(data, 2)
-        return Token(amount, denom), data
-
 
 class StringToken(Token):
     """
@@ -253,33 +532,23 @@ class StringToken(Token):
     Except that the JSON for the amount is a StringVarInt
     See StringVarInt
     """
+    fields = (
+        Field(1, 'denom', String),
+        Field(2, 'amount', StringVarInt),
+    )
+
     def __init__(self, amount, denom):
         dict.__init__(self, amount=StringVarInt(amount), denom=denom)
 
 
 class Input(Amino):
-    def __init__(self, address, coins):
-        dict.__init__(self, address=address, coins=coins)
+    fields = (
+        Field(1, 'address', Address),
+        Field(2, 'coins', Token, repeated=True),
+    )
 
-    def encode(self, field_id=None):
-        buf = Address(self['address']).encode(1)
-        buf += Repeated(self['coins']).encode(2)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    @staticmethod
-    def decode(data, field_id=None, hrp='bnb'):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        address, data = Address.decode(data, 1, hrp)
-        coins, data = Repeated.decode(data, 2, Token)
-        return Input(address, coins), data
+    def __init__(self, address, coins):
+        dict.__init__(self, address=address, coins=as_repeated(coins))
 
 
 Output = Input
@@ -1,3 +1,12 @@
+from collections import namedtuple
+import functools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
 """
 bech32.py
 
@@ -5,26 +14,65 @@ Pronounced BAYCH THIRTY TWO
 bech32 address encoding
 begins with a human readable prefix (hrp)
 ends with a checksum
+
+Addresses repeat across transactions, so both directions are memoized in bounded LRU caches
+See address_cache_info
+
+Invalid input never prints, check_bech32 and validate_addresses report why instead
+bech32_encode_many renders whole batches of raw hashes, vectorized when NumPy is installed
 """
 
 
+ADDRESS_CACHE_SIZE = 4096
+
+
 # Modified from the reference implementation: https://github.com/sipa/bech32/blob/master/ref/python/segwit_addr.py
 
 BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32_CHARSET_INDEX = {char: index for index, char in enumerate(BECH32_CHARSET)}
+BECH32_GENERATOR = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+
+
+def build_table():
+    """
+    XOR of the generators selected by each value of the top 5 bits of the checksum
+    """
+    table = []
+    for top in range(32):
+        mask = 0
+        for i in range(5):
+            if (top >> i) & 1:
+                mask ^= BECH32_GENERATOR[i]
+        table.append(mask)
+    return table
+
+
+BECH32_TABLE = build_table()
 
+# check_bech32 error codes
+INVALID_CHARACTER = 'invalid_character'
+MIXED_CASE = 'mixed_case'
+INVALID_SEPARATOR = 'invalid_separator'
+INVALID_CHECKSUM = 'invalid_checksum'
+WRONG_HRP = 'wrong_hrp'
+INVALID_PADDING = 'invalid_padding'
+INVALID_LENGTH = 'invalid_length'
 
-def bech32_polymod(values):
+
+def bech32_polymod(values, chk=1):
     """Internal function that computes the Bech32 checksum."""
-    generator = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
-    chk = 1
+    table = BECH32_TABLE
     for value in values:
-        top = chk >> 25
-        chk = (chk & 0x1ffffff) << 5 ^ value
-        for i in range(5):
-            chk ^= generator[i] if ((top >> i) & 1) else 0
+        chk = (chk & 0x1ffffff) << 5 ^ value ^ table[chk >> 25]
     return chk
 
 
+@functools.lru_cache(maxsize=64)
+def bech32_hrp_polymod(hrp):
+    """Checksum state after the expanded HRP, which is shared by every address with that HRP."""
+    return bech32_polymod(bech32_hrp_expand(hrp))
+
+
 def bech32_hrp_expand(hrp):
     """Expand the HRP into values for checksum computation."""
     return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
@@ -32,13 +80,12 @@ def bech32_hrp_expand(hrp):
 
 def bech32_verify_checksum(hrp, data):
     """Verify a checksum given HRP and converted data characters."""
-    return bech32_polymod(bech32_hrp_expand(hrp) + data) == 1
+    return bech32_polymod(data, bech32_hrp_polymod(hrp)) == 1
 
 
 def bech32_create_checksum(hrp, data):
     """Compute the checksum values given HRP and data."""
-    values = bech32_hrp_expand(hrp) + data
-    polymod = bech32_polymod(values + [0, 0, 0, 0, 0, 0]) ^ 1
+    polymod = bech32_polymod(data + [0, 0, 0, 0, 0, 0], bech32_hrp_polymod(hrp)) ^ 1
     return [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
 
 
@@ -48,26 +95,38 @@ def bech32_encode_raw(hrp, data):
     return hrp + '1' + ''.join([BECH32_CHARSET[d] for d in combined])
 
 
+def check_bech32(bech):
+    """
+    Validate a Bech32 string in a single pass over its data part
+    Returns (error, hrp, data), where error is None or one of the error codes above
+    """
+    if not bech.isascii():
+        return (INVALID_CHARACTER, None, None)
+    lower = bech.lower()
+    if lower != bech and bech.upper() != bech:
+        return (MIXED_CASE, None, None)
+    pos = lower.rfind('1')
+    if pos < 1 or pos + 7 > len(lower) or len(lower) > 90:
+        return (INVALID_SEPARATOR, None, None)
+    hrp = lower[:pos]
+    if min(hrp) < '!' or max(hrp) > '~':
+        return (INVALID_CHARACTER, None, None)
+    index = BECH32_CHARSET_INDEX
+    try:
+        data = [index[char] for char in lower[pos + 1:]]
+    except KeyError:
+        return (INVALID_CHARACTER, None, None)
+    if not bech32_verify_checksum(hrp, data):
+        return (INVALID_CHECKSUM, None, None)
+    return (None, hrp, data[:-6])
+
+
 def bech32_decode_raw(bech):
     """Validate a Bech32 string, and determine HRP and data."""
-    if ((any(ord(x) < 33 or ord(x) > 126 for x in bech)) or
-            (bech.lower() != bech and bech.upper() != bech)):
-        print('invalid: out of range')
-        return (None, None)
-    bech = bech.lower()
-    pos = bech.rfind('1')
-    if pos < 1 or pos + 7 > len(bech) or len(bech) > 90:
-        print('invalid: wrongly positioned 1')
-        return (None, None)
-    if not all(x in BECH32_CHARSET for x in bech[pos+1:]):
-        print('invalid: not all in charset')
-        return (None, None)
-    hrp = bech[:pos]
-    data = [BECH32_CHARSET.find(x) for x in bech[pos+1:]]
-    if not bech32_verify_checksum(hrp, data):
-        print('invalid: checksum')
+    error, hrp, data = check_bech32(bech)
+    if error is not None:
         return (None, None)
-    return (hrp, data[:-6])
+    return (hrp, data)
 
 
 def convertbits(data, frombits, tobits, pad=True):
@@ -97,11 +156,9 @@ def bech32_decode(hrpexpected, addr):
     """Decode a bech32 address."""
     hrpgot, data = bech32_decode_raw(addr)
     if hrpgot != hrpexpected:
-        print('invalid: %s != %s' % (hrpgot, hrpexpected))
         return (None, None)
     decoded = convertbits(data, 5, 8, False)
     if decoded is None or len(decoded) < 2 or len(decoded) > 40:
-        print('invalid decoded: %s' % decoded)
         return (None, None)
     return decoded
 
@@ -114,6 +171,132 @@ def bech32_encode(hrp, data):
     return ret
 
 
+def data_bytes(data):
+    """
+    convertbits(data, 5, 8, False) as bytes, or None if the padding is invalid
+    """
+    value = 0
+    for digit in data:
+        value = value << 5 | digit
+    padding = len(data) * 5 % 8
+    if padding >= 5 or value & ((1 << padding) - 1):
+        return None
+    return (value >> padding).to_bytes(len(data) * 5 // 8, 'big')
+
+
+AddressCheck = namedtuple('AddressCheck', ['address', 'valid', 'hrp', 'payload', 'error'])
+
+
+def validate_address(address, hrp=None, length=20):
+    """
+    Returns an AddressCheck with the payload bytes, or the error code of the first problem found
+    hrp, when given, is the expected prefix such as 'bnb'
+    """
+    error, got, data = check_bech32(address)
+    if error is not None:
+        return AddressCheck(address, False, None, None, error)
+    if hrp is not None and got != hrp:
+        return AddressCheck(address, False, got, None, WRONG_HRP)
+    payload = data_bytes(data)
+    if payload is None:
+        return AddressCheck(address, False, got, None, INVALID_PADDING)
+    if len(payload) != length:
+        return AddressCheck(address, False, got, payload, INVALID_LENGTH)
+    return AddressCheck(address, True, got, payload, None)
+
+
+def validate_addresses(addresses, hrp=None, length=20):
+    return [validate_address(address, hrp, length) for address in addresses]
+
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
 def address_bytes(address_str):
-    hrp, raw_bech32 = bech32_decode_raw(address_str)
-    return bytes(convertbits(raw_bech32, 5, 8, False))
+    error, hrp, data = check_bech32(address_str)
+    if error is not None:
+        raise ValueError('Invalid address %r: %s' % (address_str, error))
+    payload = data_bytes(data)
+    if payload is None:
+        raise ValueError('Invalid address %r: %s' % (address_str, INVALID_PADDING))
+    return payload
+
+
+def encode_address(hrp, raw):
+    """
+    bech32_encode for bytes, without converting bit by bit or decoding the result again
+    """
+    groups = (len(raw) * 8 + 4) // 5
+    value = int.from_bytes(raw, 'big') << (groups * 5 - len(raw) * 8)
+    data = [(value >> shift) & 31 for shift in range(groups * 5 - 5, -1, -5)]
+    return bech32_encode_raw(hrp, data)
+
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def address_str(hrp, raw):
+    """
+    encode_address, memoized
+    """
+    return encode_address(hrp, raw)
+
+
+def check_batch_size(size, length):
+    if size % length != 0:
+        raise ValueError('Expected hashes of %d bytes, got %d bytes in all' % (length, size))
+
+
+def check_hash_array(hashes, length):
+    if hashes.ndim not in (1, 2) or hashes.ndim == 2 and hashes.shape[1] != length:
+        raise ValueError('Expected an N x %d array of hashes, got shape %s' % (length, hashes.shape))
+    if hashes.dtype.kind not in 'iu':
+        raise ValueError('Expected an integer array of hashes, got %s' % hashes.dtype)
+    if hashes.dtype != numpy.uint8 and hashes.size and (hashes.min() < 0 or hashes.max() > 255):
+        raise ValueError('Expected hash bytes in 0..255')
+
+
+def bech32_encode_many(hashes, hrp='bnb', length=20):
+    """
+    Encode a batch of raw hashes, given as a bytes-like buffer of concatenated hashes or an N x length uint8 array
+    Raises ValueError unless the input holds a whole number of hashes, and for arrays of another shape or of values
+    that are not bytes
+    """
+    if numpy is None:
+        hashes = bytes(hashes)
+        check_batch_size(len(hashes), length)
+        return [encode_address(hrp, hashes[start:start + length]) for start in range(0, len(hashes), length)]
+    if isinstance(hashes, numpy.ndarray):
+        check_hash_array(hashes, length)
+        rows = hashes.astype(numpy.uint8, copy=False)
+    else:
+        rows = numpy.frombuffer(hashes, dtype=numpy.uint8)
+    check_batch_size(rows.size, length)
+    rows = rows.reshape(-1, length)
+    count, groups = len(rows), (length * 8 + 4) // 5
+    bits = numpy.zeros((count, groups * 5), dtype=numpy.uint8)
+    bits[:, :length * 8] = numpy.unpackbits(rows, axis=1)
+    data = bits.reshape(count, groups, 5) @ numpy.array([16, 8, 4, 2, 1], dtype=numpy.uint32)
+    table = numpy.array(BECH32_TABLE, dtype=numpy.uint32)
+    chk = numpy.full(count, bech32_hrp_polymod(hrp), dtype=numpy.uint32)
+    for column in range(groups + 6):
+        value = data[:, column] if column < groups else 0
+        chk = (chk & 0x1ffffff) << 5 ^ value ^ table[chk >> 25]
+    chk ^= 1
+    checksum = chk[:, None] >> numpy.array([25, 20, 15, 10, 5, 0], dtype=numpy.uint32) & 31
+    charset = numpy.frombuffer(BECH32_CHARSET.encode(), dtype=numpy.uint8)
+    width = len(hrp) + 1 + groups + 6
+    text = numpy.empty((count, width), dtype=numpy.uint8)
+    text[:, :len(hrp) + 1] = numpy.frombuffer((hrp + '1').encode(), dtype=numpy.uint8)
+    text[:, len(hrp) + 1:width - 6] = charset[data]
+    text[:, width - 6:] = charset[checksum]
+    joined = text.tobytes().decode('ascii')
+    return [joined[start:start + width] for start in range(0, len(joined), width)]
+
+
+def address_cache_info():
+    return {
+        'address_bytes': address_bytes.cache_info(),
+        'address_str': address_str.cache_info(),
+    }
+
+
+def address_cache_clear():
+    address_bytes.cache_clear()
+    address_str.cache_clear()
@@ -0,0 +1,163 @@
+from binance_transaction.crypto import backends, get_backend, int_to_bytes
+
+from binance_transaction import ecc
+
+import argparse
+import hashlib
+import sys
+import time
+
+
+"""
+benchmark.py
+
+Check that crypto backends agree with ecdsa, then time them
+python3 -m binance_transaction.benchmark [--count N] [backend ...]
+
+* malformed
+* check_parity
+* benchmark
+"""
+
+
+REFERENCE = 'ecdsa'
+
+
+def secrets(count):
+    """
+    Deterministic secret exponents spread over [1, N)
+    """
+    return [
+        int_to_bytes(int.from_bytes(hashlib.sha256(b'secret %d' % i).digest(), 'big') % (ecc.N - 1) + 1, 32)
+        for i in range(count)
+    ]
+
+
+def digests(count):
+    return [hashlib.sha256(b'digest %d' % i).digest() for i in range(count)]
+
+
+def malformed(public_key, digest, signature):
+    """
+    (description, verify_digest arguments) that every backend must reject by returning False
+    """
+    r, s = signature[:32], signature[32:]
+    n = int_to_bytes(ecc.N, 32)
+    return [
+        ('key off the curve', (b'\x02' + int_to_bytes(5, 32), digest, signature)),
+        ('uncompressed key off the curve', (b'\x04' + b'\x01' * 64, digest, signature)),
+        ('key x above P', (b'\x02' + b'\xff' * 32, digest, signature)),
+        ('key prefix', (b'\x05' + public_key[1:], digest, signature)),
+        ('key length', (public_key[1:], digest, signature)),
+        ('empty key', (b'', digest, signature)),
+        ('signature length', (public_key, digest, signature[:63])),
+        ('long signature', (public_key, digest, signature + b'\x00')),
+        ('r zero', (public_key, digest, b'\x00' * 32 + s)),
+        ('s zero', (public_key, digest, r + b'\x00' * 32)),
+        ('r out of range', (public_key, digest, n + s)),
+        ('s out of range', (public_key, digest, r + n)),
+        ('digest length', (public_key, digest + b'\x00', signature)),
+        ('empty digest', (public_key, b'', signature)),
+    ]
+
+
+def rejects(backend, arguments):
+    try:
+        return backend.verify_digest(*arguments) is False
+    except Exception:
+        return False
+
+
+def check_parity(names=None, count=16):
+    """
+    Compare each backend with ecdsa over count keys and digests, and check that each rejects malformed input
+    Returns a list of (backend name, operation, input index) for each disagreement
+    """
+    reference = get_backend(REFERENCE)
+    mismatches = []
+    for name in names or sorted(backends):
+        backend = get_backend(name)
+        for i, (secret, digest) in enumerate(zip(secrets(count), digests(count))):
+            expected_key = reference.prepare(secret)
+            public_key = reference.public_key(expected_key)
+            signature = reference.sign_digest(expected_key, digest)
+            uncompressed = reference.decompress(public_key)
+            s = int.from_bytes(signature[32:], 'big')
+            high_s = signature[:32] + int_to_bytes(ecc.N - s, 32)
+            key = backend.prepare(secret)
+            checks = (
+                ('public_key', backend.public_key(key) == public_key),
+                ('sign_digest', backend.sign_digest(key, digest) == signature),
+                ('verify_digest', backend.verify_digest(public_key, digest, signature)),
+                ('verify_digest uncompressed', backend.verify_digest(uncompressed, digest, signature)),
+                ('verify_digest high S', backend.verify_digest(public_key, digest, high_s)),
+                ('verify_digest wrong digest', not backend.verify_digest(public_key, digest[::-1], signature)),
+                ('decompress', backend.decompress(public_key) == uncompressed),
+                ('compress', backend.compress(uncompressed) == public_key),
+            )
+            mismatches.extend((name, operation, i) for operation, agrees in checks if not agrees)
+            for description, arguments in malformed(public_key, digest, signature):
+                if not rejects(backend, arguments):
+                    mismatches.append((name, 'verify_digest ' + description, i))
+    return mismatches
+
+
+def seconds_per_call(function, inputs):
+    start = time.perf_counter()
+    for arguments in inputs:
+        function(*arguments)
+    return (time.perf_counter() - start) / len(inputs)
+
+
+def benchmark(names=None, count=200, keys=8):
+    """
+    Seconds per call of each operation, by backend name
+    Signing and verification cycle through a few keys, like a signer or a busy ingest would
+    One-time setup such as tables of multiples of G is excluded by a warm-up round
+    """
+    reference = get_backend(REFERENCE)
+    prepared = [reference.prepare(secret) for secret in secrets(keys)]
+    public_keys = [reference.public_key(key) for key in prepared]
+    messages = digests(count)
+    signed = [
+        (public_keys[i % keys], digest, reference.sign_digest(prepared[i % keys], digest))
+        for i, digest in enumerate(messages)
+    ]
+    uncompressed = [(reference.decompress(public_key),) for public_key in public_keys]
+    timings = {}
+    for name in names or sorted(backends):
+        backend = get_backend(name)
+        keys_by_index = [backend.prepare(secret) for secret in secrets(keys)]
+        signing = [(keys_by_index[i % keys], digest) for i, digest in enumerate(messages)]
+        operations = (
+            ('sign_digest', backend.sign_digest, signing),
+            ('verify_digest', backend.verify_digest, signed),
+            ('decompress', backend.decompress, [(public_key,) for public_key in public_keys]),
+            ('compress', backend.compress, uncompressed),
+        )
+        timings[name] = {}
+        for operation, function, inputs in operations:
+            seconds_per_call(function, inputs[:keys])
+            timings[name][operation] = seconds_per_call(function, inputs)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and time the crypto backends')
+    parser.add_argument('names', nargs='*', help='backends, all available by default')
+    parser.add_argument('--count', type=int, default=200)
+    args = parser.parse_args()
+
+    mismatches = check_parity(args.names)
+    for name, operation, index in mismatches:
+        print('{} disagrees with {} on {} for input {}'.format(name, REFERENCE, operation, index))
+    timings = benchmark(args.names, args.count)
+    operations = ('sign_digest', 'verify_digest', 'decompress', 'compress')
+    print('{:<12}'.format('us per call') + ''.join('{:>16}'.format(operation) for operation in operations))
+    for name, timing in timings.items():
+        print('{:<12}'.format(name) + ''.join('{:>16.1f}'.format(timing[operation] * 1e6) for operation in operations))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
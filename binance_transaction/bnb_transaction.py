@@ -1,12 +1,18 @@
-from binance_transaction.base import Repeated, Amino, String, StringVarInt, VarInt
-from binance_transaction.crypto import compress_key, int_to_bytes, int_from_bytes, secp256k1
+from binance_transaction.base import Repeated, Amino, Bytes, String, StringVarInt, read_repeated
+from binance_transaction.canonical import write_value
+from binance_transaction.compact import Record
+from binance_transaction.varint import varint_size
+from binance_transaction.wire import (
+    begin_message, check_end, end_message, read_field, read_length, read_object_id, write_message
+)
+from binance_transaction.crypto import compress_key, low_s, private_key
 from binance_transaction.signature import BnbSignature
-from binance_transaction.msg import Msg
+from binance_transaction.msg import Msg, msg_class_by_object_id, msg_class_by_type, msg_type_by_class
 
 
+from collections.abc import Mapping
 import base64
 import hashlib
-import json
 
 
 """
@@ -16,6 +22,10 @@ Higher-level transaction objects
 
 * BnbTransaction
 * TestBnbTransaction
+* SigningTemplate
+* sign_many
+* TransactionRecord
+* LazyTransaction
 """
 
 
@@ -27,6 +37,10 @@ class BnbTransaction(Amino):
     def chain_id():
         return String("Binance-Chain-Tigris")
 
+    @staticmethod
+    def hrp():
+        return 'bnb'
+
     def __init__(self, account_number, sequence, source='887'):
         dict.__init__(
             self,
@@ -41,21 +55,51 @@ class BnbTransaction(Amino):
         )
 
     def signing_json(self):
-        return json.dumps({
-            "account_number": self['account_number'],
-            "chain_id": self['chain_id'],
-            "data": self['data'],
-            "memo": self['memo'],
-            "msgs": self['msgs'],
-            "sequence": self['sequence'],
-            "source": self['source'],
-        }, sort_keys=True, separators=(',', ':')).encode('utf8')
+        """
+        Canonical JSON of the signed fields, in sorted key order
+        Messages cache their part, see canonical.py
+        """
+        return self.signing_prefix() + self.signing_suffix()
+
+    def signing_prefix(self):
+        """
+        Signing JSON up to the messages, which SigningTemplate hashes once for many transactions
+        """
+        parts = ['{"account_number":']
+        write_value(self['account_number'], parts)
+        parts.append(',"chain_id":')
+        write_value(self['chain_id'], parts)
+        parts.append(',"data":')
+        write_value(self['data'], parts)
+        parts.append(',"memo":')
+        write_value(self['memo'], parts)
+        parts.append(',"msgs":')
+        return ''.join(parts).encode('utf8')
+
+    def signing_suffix(self):
+        """
+        Signing JSON from the messages on
+        """
+        parts = []
+        write_value(self['msgs'], parts)
+        parts.append(',"sequence":')
+        write_value(self['sequence'], parts)
+        parts.append(',"source":')
+        write_value(self['source'], parts)
+        parts.append('}')
+        return ''.join(parts).encode('utf8')
 
     def signing_hash(self):
         signing_bytes = self.signing_json()
         signing_hash = hashlib.sha256(signing_bytes).digest()
         return signing_hash
 
+    def signing_template(self):
+        """
+        SigningTemplate for transactions sharing this one's account number, chain id, data and memo
+        """
+        return SigningTemplate(self)
+
     def hash(self):
         return hashlib.sha256(self.encode()).digest()
 
@@ -65,11 +109,7 @@ class BnbTransaction(Amino):
             # compress uncompressed public key
             public_key = compress_key(public_key)
         assert len(public_key) == 33
-        if int_from_bytes(signature[32:64]) > secp256k1['base'] // 2:
-            # Enforce low S (EIP2)
-            r = signature[0:32]
-            s = int_to_bytes(secp256k1['base'] - int_from_bytes(signature[32:64]), 32)
-            signature = r + s
+        signature = low_s(signature)
         self['signatures'].append(BnbSignature(
             base64.b64encode(public_key).decode('utf8'),
             base64.b64encode(signature).decode('utf8'),
@@ -77,6 +117,19 @@ class BnbTransaction(Amino):
             self['sequence']
         ))
 
+    def sign(self, key, template=None):
+        """
+        Sign with key, which is anything crypto.private_key accepts, and attach the signature
+        template is an optional SigningTemplate to hash with
+        """
+        key = private_key(key)
+        digest = self.signing_hash() if template is None else template.signing_hash(self)
+        self.apply_sig(key.sign_digest(digest), key.public_key)
+        return self
+
+    def signers(self):
+        return [signature.signer(self.hrp()) for signature in self['signatures']]
+
     def remove_sig(self):
         self['signatures'] = Repeated([])
 
@@ -88,31 +141,88 @@ class BnbTransaction(Amino):
         return bytes.fromhex('F0625DEE')
 
     def encode(self):
-        buf = self.object_id()
-        buf += self['msgs'].encode(1)
-        buf += self['signatures'].encode(2)
-        buf += self['memo'].encode(3)
-        buf += self['source'].encode(4)
+        buf = bytearray()
+        self.encode_into(buf)
+        return bytes(buf)
+
+    def encode_into(self, buf, field_id=None):
+        """
+        Messages and the transaction body are cached, so after a new signature or memo
+        only the changed parts are encoded again
+        """
+        if self._encoded is not None:
+            write_message(buf, self._encoded, field_id)
+            return
+        offset = begin_message(buf, field_id)
+        start = len(buf)
+        buf += self.object_id()
+        self['msgs']._adopt(self)
+        self['msgs'].encode_into(buf, 1)
+        self['signatures']._adopt(self)
+        self['signatures'].encode_into(buf, 2)
+        String.encode_into(self['memo'], buf, 3)
+        self['source'].encode_into(buf, 4)
         if self['data'] is not None:
-            buf += self['data'].encode(5)
-        return VarInt(len(buf)).encode() + buf
+            self['data'].encode_into(buf, 5)
+        self._encoded = bytes(buf[start:])
+        end_message(buf, offset)
+
+    def encoded_size(self, field_id=None):
+        if self._encoded is not None:
+            size = len(self._encoded)
+        else:
+            size = len(self.object_id())
+            size += self['msgs'].encoded_size(1)
+            size += self['signatures'].encoded_size(2)
+            size += String.encoded_size(self['memo'], 3)
+            size += self['source'].encoded_size(4)
+            if self['data'] is not None:
+                size += self['data'].encoded_size(5)
+        if field_id is None:
+            return varint_size(size) + size
+        return varint_size(field_id << 3 | 2) + varint_size(size) + size
 
     @classmethod
     def decode(klass, data):
-        assert data[0:4] == klass.object_id()
-        data = data[4:]
-        msgs, data = Repeated.decode(data, 1, Msg)
-        signatures, data = Repeated.decode(data, 2, BnbSignature)
-        memo, data = String.decode(data, 3)
-        source, data = StringVarInt.decode(data, 4)
-        tx_data, data = String.decode(data, 5)
-        account_number = signatures[0]['account_number']
-        sequence = signatures[0]['sequence']
-        tx = klass(msgs, account_number, sequence, source)
+        view = memoryview(data)
+        start, end = read_length(view, 0, len(view))
+        return klass.read_body(view, start, end, klass.hrp()), data[end:]
+
+    @classmethod
+    def read_body(klass, data, pos, end, hrp='bnb'):
+        pos = read_object_id(data, pos, end, klass.object_id())
+        msgs, pos = read_repeated(Msg, data, pos, end, 1, hrp)
+        signatures, pos = read_repeated(BnbSignature, data, pos, end, 2, hrp)
+        memo, pos = read_field(String, data, pos, end, 3)
+        source, pos = read_field(StringVarInt, data, pos, end, 4)
+        tx_data, pos = read_field(Bytes, data, pos, end, 5)
+        check_end(pos, end)
+        if len(signatures) > 0:
+            tx = klass(signatures[0]['account_number'], signatures[0]['sequence'], source)
+        else:
+            tx = klass(0, 0, source)
         tx['msgs'] = msgs
         tx['signatures'] = signatures
-        tx['chain_id'] = klass.chain_id()
-        return tx, data
+        tx['memo'] = memo
+        if len(tx_data) > 0:
+            tx['data'] = tx_data
+        return tx
+
+    @classmethod
+    def decode_compact(klass, data):
+        """
+        Decode into a TransactionRecord, which holds raw values until they are read
+        """
+        view = memoryview(data)
+        start, end = read_length(view, 0, len(view))
+        return TransactionRecord.read_body(klass, view, start, end)
+
+    @classmethod
+    def decode_lazy(klass, data):
+        """
+        Decode into a LazyTransaction, which decodes messages and signatures when they are read
+        """
+        return LazyTransaction(klass, data)
 
     @classmethod
     def from_obj(klass, transaction_data):
@@ -134,3 +244,229 @@ class TestBnbTransaction(BnbTransaction):
     @staticmethod
     def chain_id():
         return String("Binance-Chain-Nile")
+
+    @staticmethod
+    def hrp():
+        return 'tbnb'
+
+
+class SigningTemplate(object):
+    """
+    Signing hashes for a run of transactions that differ only from the messages on
+    The sorted signing JSON starts with account_number, chain_id, data and memo,
+    so the SHA-256 state after that prefix is kept and copied for each transaction
+    """
+    __slots__ = ('values', 'state')
+
+    def __init__(self, tx):
+        self.values = self.prefix_values(tx)
+        self.state = hashlib.sha256(tx.signing_prefix())
+
+    @staticmethod
+    def prefix_values(tx):
+        account_number, chain_id, data, memo = tx['account_number'], tx['chain_id'], tx['data'], tx['memo']
+        # types as well, since 1 == True but they differ in JSON
+        return (
+            account_number, chain_id, data, memo, type(account_number), type(chain_id), type(data), type(memo)
+        )
+
+    def matches(self, tx):
+        return self.prefix_values(tx) == self.values
+
+    def signing_hash(self, tx):
+        """
+        tx.signing_hash(), which it falls back to for a transaction with another prefix
+        """
+        if not self.matches(tx):
+            return tx.signing_hash()
+        state = self.state.copy()
+        state.update(tx.signing_suffix())
+        return state.digest()
+
+
+def sign_many(txs, key):
+    """
+    Sign each transaction with the same key, prepared once
+    Transactions sharing a signing prefix share a SigningTemplate
+    """
+    key = private_key(key)
+    templates = {}
+    for tx in txs:
+        values = SigningTemplate.prefix_values(tx)
+        template = templates.get(values)
+        if template is None:
+            template = templates[values] = SigningTemplate(tx)
+        tx.sign(key, template)
+    return txs
+
+
+class TransactionRecord(Record):
+    """
+    Compact form of a decoded BnbTransaction
+    """
+    __slots__ = ('transaction', 'msgs', 'signatures', 'memo', 'source', 'data')
+    index = dict.fromkeys(['account_number', 'sequence', 'source', 'msgs', 'chain_id', 'memo', 'signatures', 'data'])
+
+    @classmethod
+    def read_body(klass, transaction, data, pos, end):
+        hrp = transaction.hrp()
+        pos = read_object_id(data, pos, end, transaction.object_id())
+        msgs = []
+        while pos < end and data[pos] == 1 << 3 | 2:
+            msg, pos = Msg.read_record(data, pos + 1, end, hrp)
+            msgs.append(msg)
+        signatures = []
+        while pos < end and data[pos] == 2 << 3 | 2:
+            signature, pos = BnbSignature.read_record(data, pos + 1, end, hrp)
+            signatures.append(signature)
+        memo, pos = read_field(String, data, pos, end, 3)
+        source, pos = read_field(StringVarInt, data, pos, end, 4)
+        tx_data, pos = read_field(Bytes, data, pos, end, 5)
+        check_end(pos, end)
+        record = klass()
+        record.hrp = hrp
+        record.transaction = transaction
+        record.msgs = tuple(msgs)
+        record.signatures = tuple(signatures)
+        record.memo = str(memo)
+        record.source = int(source)
+        record.data = tx_data or None
+        return record
+
+    def __getitem__(self, name):
+        if name in ('account_number', 'sequence'):
+            if len(self.signatures) == 0:
+                return StringVarInt(0)
+            return self.signatures[0][name]
+        if name == 'chain_id':
+            return self.transaction.chain_id()
+        if name in ('msgs', 'signatures'):
+            return list(getattr(self, name))
+        if name == 'memo':
+            return String(self.memo)
+        if name == 'source':
+            return StringVarInt(self.source)
+        if name == 'data':
+            return self.data
+        raise KeyError(name)
+
+    def to_amino(self):
+        tx = self.transaction(self['account_number'], self['sequence'], self['source'])
+        tx['msgs'] = Repeated([msg.to_amino() for msg in self.msgs])
+        tx['signatures'] = Repeated([signature.to_amino() for signature in self.signatures])
+        tx['memo'] = self['memo']
+        tx['data'] = self.data
+        return tx
+
+    def encode(self):
+        return self.to_amino().encode()
+
+    def signing_json(self):
+        return self.to_amino().signing_json()
+
+
+class LazyTransaction(Mapping):
+    """
+    Encoded transaction that only records where each message and signature is
+    Message types come from their object ids, and messages are decoded on first access
+    """
+    index = TransactionRecord.index
+
+    def __init__(self, transaction, data):
+        self.transaction = transaction
+        self.hrp = transaction.hrp()
+        view = memoryview(data)
+        start, end = read_length(view, 0, len(view))
+        self.encoded = bytes(view[:end])
+        self.view = view = memoryview(self.encoded)
+        pos = read_object_id(view, start, end, transaction.object_id())
+        self.msg_bounds = []
+        while pos < end and view[pos] == 1 << 3 | 2:
+            msg_start, pos = read_length(view, pos + 1, end)
+            self.msg_bounds.append((msg_start, pos))
+        self.signature_bounds = []
+        while pos < end and view[pos] == 2 << 3 | 2:
+            signature_start, pos = read_length(view, pos + 1, end)
+            self.signature_bounds.append((signature_start, pos))
+        self.memo, pos = read_field(String, view, pos, end, 3)
+        self.source, pos = read_field(StringVarInt, view, pos, end, 4)
+        self.data, pos = read_field(Bytes, view, pos, end, 5)
+        check_end(pos, end)
+        self.msgs = [None] * len(self.msg_bounds)
+        self.signatures = [None] * len(self.signature_bounds)
+
+    def hash(self):
+        return hashlib.sha256(self.encoded).digest()
+
+    def encode(self):
+        return self.encoded
+
+    def msg_object_id(self, index):
+        start, end = self.msg_bounds[index]
+        return bytes(self.view[start:start + 4])
+
+    def msg_class(self, index):
+        """
+        None for unsupported messages, which only raise UnsupportedBnbMessage when decoded
+        """
+        return msg_class_by_object_id.get(self.msg_object_id(index))
+
+    def msg_types(self):
+        return [msg_type_by_class.get(self.msg_class(index)) for index in range(len(self.msg_bounds))]
+
+    def msg(self, index):
+        if self.msgs[index] is None:
+            start, end = self.msg_bounds[index]
+            self.msgs[index] = Msg.read_body(self.view, start, end, self.hrp)
+        return self.msgs[index]
+
+    def find(self, *msg_types):
+        """
+        Decode only the messages of the given types, such as 'dex/NewOrder'
+        Returns their indexes and messages
+        """
+        wanted = set(msg_class_by_type[msg_type] for msg_type in msg_types)
+        return [
+            (index, self.msg(index)) for index in range(len(self.msg_bounds)) if self.msg_class(index) in wanted
+        ]
+
+    def signers(self):
+        return [self.signature(index).signer(self.hrp) for index in range(len(self.signature_bounds))]
+
+    def signature(self, index):
+        if self.signatures[index] is None:
+            start, end = self.signature_bounds[index]
+            self.signatures[index] = BnbSignature.read_body(self.view, start, end, self.hrp)
+        return self.signatures[index]
+
+    def __getitem__(self, name):
+        if name in ('account_number', 'sequence'):
+            if len(self.signature_bounds) == 0:
+                return StringVarInt(0)
+            return self.signature(0)[name]
+        if name == 'chain_id':
+            return self.transaction.chain_id()
+        if name == 'msgs':
+            return [self.msg(index) for index in range(len(self.msg_bounds))]
+        if name == 'signatures':
+            return [self.signature(index) for index in range(len(self.signature_bounds))]
+        if name == 'memo':
+            return self.memo
+        if name == 'source':
+            return self.source
+        if name == 'data':
+            return self.data or None
+        raise KeyError(name)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def to_amino(self):
+        start, end = read_length(self.view, 0, len(self.view))
+        return self.transaction.read_body(self.view, start, end, self.hrp)
+
+    def signing_json(self):
+        return self.to_amino().signing_json()
@@ -0,0 +1,81 @@
+from json.encoder import encode_basestring_ascii
+import functools
+import json
+
+
+"""
+canonical.py
+
+Canonical JSON, byte for byte what json.dumps(value, sort_keys=True, separators=(',', ':')) writes
+Values are appended to a list of str parts, joined once at the end
+Messages and Repeated write themselves through write_json, see schema.compile_json_writer
+Anything else json knows how to write, such as floats, goes through json.dumps
+
+* dumps
+* write_value
+* write_mapping
+* canonical_json
+"""
+
+
+dumps = functools.partial(json.dumps, sort_keys=True, separators=(',', ':'))
+
+
+def write_value(value, parts, parent=None):
+    """
+    Append the JSON of value to parts
+    Nested messages are adopted by parent, so that mutating them clears its caches, see base.Tracked
+    """
+    if isinstance(value, str):
+        parts.append(encode_basestring_ascii(value))
+    elif value is None:
+        parts.append('null')
+    elif value is True:
+        parts.append('true')
+    elif value is False:
+        parts.append('false')
+    elif isinstance(value, int):
+        parts.append(int.__repr__(value))
+    elif hasattr(value, 'write_json'):
+        if parent is not None:
+            value._adopt(parent)
+        value.write_json(parts)
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            parts.append('[]')
+            return
+        separator = '['
+        for item in value:
+            parts.append(separator)
+            separator = ','
+            write_value(item, parts, parent)
+        parts.append(']')
+    elif isinstance(value, dict):
+        write_mapping(value, parts, parent)
+    else:
+        parts.append(dumps(value))
+
+
+def write_mapping(mapping, parts, parent=None):
+    if not all(isinstance(key, str) for key in mapping):
+        # json.dumps converts other keys before sorting them
+        parts.append(dumps(mapping))
+        return
+    if not mapping:
+        parts.append('{}')
+        return
+    separator = '{'
+    for key, value in sorted(mapping.items()):
+        parts.append(separator + encode_basestring_ascii(key) + ':')
+        separator = ','
+        write_value(value, parts, parent)
+    parts.append('}')
+
+
+def canonical_json(value):
+    """
+    The canonical JSON of value, as bytes
+    """
+    parts = []
+    write_value(value, parts)
+    return ''.join(parts).encode('utf8')
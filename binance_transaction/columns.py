@@ -0,0 +1,152 @@
+from binance_transaction.base import Address, Input, Output, Repeated, String, Token, VarInt, make_prefix
+from binance_transaction.dex import GTE, LIMIT_ORDER, NewOrder
+from binance_transaction.token import Send
+from binance_transaction.varint import varint_bytes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+"""
+columns.py
+
+Bulk construction from NumPy columns of prices, quantities and amounts
+NumPy is optional: pip3 install bnb-tx[numpy]
+
+Amounts on chain are int64 in units of 1e-8
+Values are scaled, validated and VarInt-encoded a column at a time
+The resulting messages have their encoding precomputed
+
+* to_fixed
+* varint_column
+* new_orders
+* send_column
+"""
+
+
+SCALE = 10 ** 8
+INT64_MAX = 2 ** 63 - 1
+# float64 stops representing every integer here
+FLOAT_EXACT = 2 ** 53
+
+
+def require_numpy():
+    if numpy is None:
+        raise ImportError('binance_transaction.columns requires numpy: pip3 install bnb-tx[numpy]')
+    return numpy
+
+
+def check(bad, message):
+    if bad.any():
+        indexes = numpy.flatnonzero(bad)
+        raise ValueError('%s: %d values, first at index %d' % (message, len(indexes), indexes[0]))
+
+
+def to_fixed(values, lot_size=1, minimum=1, maximum=INT64_MAX):
+    """
+    Scale decimal units by 1e8 into an int64 array
+    Raises ValueError for values that are not finite, have more than 8 decimals, overflow int64,
+    fall outside [minimum, maximum] or are not a multiple of lot_size (itself in units of 1e-8)
+    """
+    require_numpy()
+    values = numpy.asarray(values)
+    if values.ndim != 1:
+        raise ValueError('Expected a 1-dimensional column, got shape %s' % (values.shape,))
+    if values.dtype.kind in 'iu':
+        check((values < 0) | (values > INT64_MAX // SCALE), 'Out of int64 range after scaling')
+        fixed = values.astype(numpy.int64) * SCALE
+    elif values.dtype.kind == 'f':
+        scaled = values.astype(numpy.float64) * SCALE
+        check(~numpy.isfinite(scaled), 'Not finite')
+        rounded = numpy.rint(scaled)
+        check((rounded < 0) | (rounded > FLOAT_EXACT), 'Out of exact float range after scaling')
+        # float64 rounding of value * 1e8 stays under one ulp, an extra decimal lands further off
+        check(numpy.abs(scaled - rounded) > numpy.abs(scaled) * 2 ** -52, 'More than 8 decimals')
+        fixed = rounded.astype(numpy.int64)
+    else:
+        raise TypeError('Expected an integer or float column, got %s' % values.dtype)
+    check((fixed < minimum) | (fixed > maximum), 'Outside [%d, %d]' % (minimum, maximum))
+    if lot_size != 1:
+        check(fixed % lot_size != 0, 'Not a multiple of %d' % lot_size)
+    return fixed
+
+
+def varint_column(values):
+    """
+    VarInt encodings of a column of non-negative ints, as a list of bytes
+    """
+    require_numpy()
+    values = numpy.asarray(values).astype(numpy.uint64)
+    sizes = numpy.ones(len(values), dtype=numpy.int64)
+    for width in range(1, 10):
+        sizes += values >= numpy.uint64(1 << 7 * width)
+    positions = numpy.arange(10)
+    groups = (values[:, None] >> (positions * 7).astype(numpy.uint64)) & numpy.uint64(127)
+    groups |= (positions < sizes[:, None] - 1).astype(numpy.uint64) << numpy.uint64(7)
+    packed = groups[positions < sizes[:, None]].astype(numpy.uint8).tobytes()
+    ends = numpy.cumsum(sizes).tolist()
+    starts = [0] + ends[:-1]
+    return [packed[start:end] for start, end in zip(starts, ends)]
+
+
+def new_orders(sender, symbol, side, order_ids, prices, quantities, ordertype=LIMIT_ORDER, timeinforce=GTE,
+               tick_size=1, lot_size=1):
+    """
+    NewOrder messages from columns of prices and quantities in decimal units
+    tick_size and lot_size are in units of 1e-8
+    """
+    prices = to_fixed(prices, tick_size)
+    quantities = to_fixed(quantities, lot_size)
+    order_ids = list(order_ids)
+    if not len(order_ids) == len(prices) == len(quantities):
+        raise ValueError('Columns differ in length: %d ids, %d prices, %d quantities' % (
+            len(order_ids), len(prices), len(quantities)))
+    head = NewOrder.object_id() + Address(sender).encode(1)
+    middle = String(symbol).encode(3) + VarInt(ordertype).encode(4) + VarInt(side).encode(5) + make_prefix(6, 0)
+    quantity_prefix = make_prefix(7, 0)
+    tail = VarInt(timeinforce).encode(8)
+    orders = []
+    for order_id, price, price_bytes, quantity, quantity_bytes in zip(
+            order_ids, prices.tolist(), varint_column(prices), quantities.tolist(), varint_column(quantities)):
+        order = NewOrder(sender, order_id, symbol, ordertype, side, price, quantity, timeinforce)
+        order._encoded = b''.join((
+            head, String(order_id).encode(2), middle, price_bytes, quantity_prefix, quantity_bytes, tail
+        ))
+        orders.append(order)
+    return orders
+
+
+def send_column(from_address, denom, recipients, amounts, lot_size=1):
+    """
+    One Send paying each recipient its amount in decimal units, from a single input for the total
+    """
+    amounts = to_fixed(amounts, lot_size)
+    recipients = list(recipients)
+    if len(recipients) != len(amounts):
+        raise ValueError('Columns differ in length: %d recipients, %d amounts' % (len(recipients), len(amounts)))
+    total = sum(amounts.tolist())
+    if total > INT64_MAX:
+        raise ValueError('Total %d overflows int64' % total)
+    source = Input(from_address, [Token(total, denom)])
+    body = bytearray(Send.object_id())
+    source.encode_into(body, 1)
+    denom_bytes = String(denom).encode(1) + make_prefix(2, 0)
+    outputs = Repeated([])
+    for recipient, amount, amount_bytes in zip(recipients, amounts.tolist(), varint_column(amounts)):
+        output = Output(recipient, [Token(amount, denom)])
+        # link what encode_into would have, so mutations below the Send clear its encoding
+        output['coins'][0]._adopt(output['coins'])
+        output['coins']._adopt(output)
+        output._adopt(outputs)
+        outputs.append(output)
+        token = denom_bytes + amount_bytes
+        output_bytes = Address(recipient).encode(1) + make_prefix(2, 2) + varint_bytes(len(token)) + token
+        body += make_prefix(2, 2) + varint_bytes(len(output_bytes)) + output_bytes
+    send = Send(Repeated([source]), outputs)
+    source._adopt(send['inputs'])
+    send['inputs']._adopt(send)
+    outputs._adopt(send)
+    send._encoded = bytes(body)
+    return send
@@ -0,0 +1,71 @@
+from collections.abc import Mapping
+import keyword
+
+
+"""
+compact.py
+
+Compact decoded messages
+A Record keeps raw ints, str and bytes in __slots__ rather than a dict of wrapped values
+The usual Amino types are only built when a value is read or the record is materialized
+
+* Record
+* slot_name
+"""
+
+
+def slot_name(name):
+    """
+    JSON names such as 'from' are Python keywords
+    """
+    return name + '_' if keyword.iskeyword(name) else name
+
+
+class Record(Mapping):
+    """
+    Read-only mapping view of a decoded message
+    Subclasses are generated by schema.compile_schema for each message class
+    """
+    __slots__ = ('hrp',)
+    amino = None
+    fields = ()
+    index = {}
+    repeated = list
+
+    def __getitem__(self, name):
+        field = self.index[name]
+        raw = getattr(self, slot_name(name))
+        if field.repeated:
+            return list(raw)
+        if field.nested:
+            return raw
+        return field.klass.from_raw(raw, self.hrp)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, dict(self))
+
+    def to_amino(self):
+        """
+        Materialize the equivalent Amino object
+        """
+        values = {}
+        for field in self.fields:
+            raw = getattr(self, slot_name(field.name))
+            if field.repeated:
+                values[field.name] = self.repeated([record.to_amino() for record in raw])
+            elif field.nested:
+                values[field.name] = None if raw is None else raw.to_amino()
+            else:
+                values[field.name] = field.klass.from_raw(raw, self.hrp)
+        amino = dict.__new__(self.amino)
+        dict.__init__(amino, values)
+        return amino
+
+    def encode(self, field_id=None):
+        return self.to_amino().encode(field_id)
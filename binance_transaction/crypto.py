@@ -1,23 +1,47 @@
-from ecdsa import VerifyingKey
+from ecdsa import SigningKey, VerifyingKey, ellipticcurve
 from ecdsa.curves import SECP256k1
 from ecdsa.keys import BadSignatureError
 
+from binance_transaction import ecc
+from binance_transaction.bech32 import address_str, bech32_encode_many
+from binance_transaction.ripemd160 import ripemd160
+
+import functools
+import hashlib
+import os
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
 """
 crypto.py
 
 Utilities for discrete mathematics and cryptography
+
+secp256k1 signing and verification go through a backend:
+* ecdsa, the reference
+* python, ecc.py, faster than ecdsa without native code
+* coincurve, libsecp256k1 bindings, when installed: pip3 install coincurve
+BNB_TX_CRYPTO_BACKEND or use_backend selects one by name, and 'auto' picks the fastest available
+All of them produce the same signatures, see benchmark.py
 """
 
 
+PUBLIC_KEY_CACHE_SIZE = 4096
+VERIFYING_KEY_CACHE_SIZE = 1024
+# precomputation costs about two verifications, so only keys seen again get tables
+PRECOMPUTE_AFTER = 2
+BACKEND_VARIABLE = 'BNB_TX_CRYPTO_BACKEND'
+DEFAULT_BACKEND = 'ecdsa'
+# for 'auto', fastest first
+FASTEST_BACKENDS = ('coincurve', 'python', 'ecdsa')
+
+
 def pow_mod(x, y, z):
     "Calculate (x ** y) % z efficiently."
-    number = 1
-    while y:
-        if y & 1:
-            number = number * x % z
-        y >>= 1
-        x = x * x % z
-    return number
+    return pow(x, y, z)
 
 
 def int_to_bytes(x, length=False):
@@ -29,8 +53,8 @@ def int_from_bytes(xbytes):
 
 
 secp256k1 = {
-    "prime": 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F,
-    "base": 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141,
+    "prime": ecc.P,
+    "base": ecc.N,
     "name": 'secp256k1',
 }
 
@@ -39,13 +63,23 @@ def uncompress_key(compressed_key, prime=secp256k1['prime']):
     assert len(compressed_key) == 33
     y_parity = int_from_bytes(compressed_key[:1]) - 2
     x = int_from_bytes(compressed_key[1:])
-    a = (pow_mod(x, 3, prime) + 7) % prime
-    y = pow_mod(a, (prime+1)//4, prime)
+    a = (pow(x, 3, prime) + 7) % prime
+    y = pow(a, (prime+1)//4, prime)
     if y % 2 != y_parity:
         y = -y % prime
     return b'\x04' + int_to_bytes(x, 32) + int_to_bytes(y, 32)
 
 
+def low_s(signature, order=secp256k1['base']):
+    """
+    Enforce low S (EIP2) on a 64-byte r || s signature
+    """
+    s = int_from_bytes(signature[32:64])
+    if s > order // 2:
+        return signature[0:32] + int_to_bytes(order - s, 32)
+    return signature
+
+
 def compress_key(uncompressed_key):
     assert len(uncompressed_key) == 65
     assert uncompressed_key[0:1] == b'\x04'
@@ -53,10 +87,285 @@ def compress_key(uncompressed_key):
     return int_to_bytes(y_odd + 2, 1) + uncompressed_key[1:33]
 
 
-def verify_sig(uncompressed_public_key, digest, signature, curve=SECP256k1):
-    assert len(uncompressed_public_key) == 65
-    vk = VerifyingKey.from_string(uncompressed_public_key[1:], curve=curve)
-    try:
-        return vk.verify_digest(signature, digest)
-    except BadSignatureError:
-        return False
+@functools.lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def public_key_hash(public_key):
+    """
+    RIPEMD160(SHA256(compressed public key)), the 20 bytes behind an address
+    Accepts compressed or uncompressed keys
+    """
+    if len(public_key) == 65:
+        public_key = compress_key(public_key)
+    assert len(public_key) == 33
+    return ripemd160(hashlib.sha256(public_key).digest())
+
+
+def public_key_address(public_key, hrp='bnb'):
+    return address_str(hrp, public_key_hash(bytes(public_key)))
+
+
+def public_key_addresses(public_keys, hrp='bnb'):
+    """
+    Addresses for many public keys, bech32-encoded as one batch
+    """
+    return bech32_encode_many(b''.join(public_key_hash(bytes(public_key)) for public_key in public_keys), hrp)
+
+
+def precompute(verifying_key, curve):
+    """
+    A copy of verifying_key with the point multiplication tables that speed up verification about 2 times
+    VerifyingKey.precompute needs the point order, which keys from from_string lack
+    ecdsa before 0.15 has no tables, so only the parsed-key cache applies there and verifying_key is returned as is
+    """
+    if not hasattr(VerifyingKey, 'precompute'):
+        return verifying_key
+    point = verifying_key.pubkey.point
+    point = ellipticcurve.PointJacobi(curve.curve, point.x(), point.y(), 1, curve.order, generator=True)
+    verifying_key = VerifyingKey.from_public_point(point, curve=curve)
+    verifying_key.precompute()
+    return verifying_key
+
+
+class CachedVerifyingKey(object):
+    __slots__ = ('verifying_key', 'curve', 'uses')
+
+    def __init__(self, public_key, curve):
+        if len(public_key) == 33 and public_key[0] in (2, 3):
+            public_key = uncompress_key(public_key)
+        if len(public_key) != 65 or public_key[0] != 4:
+            raise ValueError('Expected a 33-byte compressed or 65-byte uncompressed public key')
+        self.verifying_key = VerifyingKey.from_string(public_key[1:], curve=curve)
+        self.curve = curve
+        self.uses = 0
+
+    def verify_digest(self, signature, digest):
+        self.uses += 1
+        if self.uses == PRECOMPUTE_AFTER:
+            self.verifying_key = precompute(self.verifying_key, self.curve)
+        try:
+            return self.verifying_key.verify_digest(signature, digest)
+        except BadSignatureError:
+            return False
+
+
+@functools.lru_cache(maxsize=VERIFYING_KEY_CACHE_SIZE)
+def verifying_key(public_key):
+    """
+    Prepared secp256k1 key for a compressed (or uncompressed) public key
+    See verifying_key.cache_info() for hits and misses
+    """
+    return CachedVerifyingKey(public_key, SECP256k1)
+
+
+def der_signature(signature):
+    """
+    DER encoding of a 64-byte r || s signature
+    """
+    integers = b''
+    for half in (signature[:32], signature[32:]):
+        value = half.lstrip(b'\x00') or b'\x00'
+        if value[0] & 0x80:
+            value = b'\x00' + value
+        integers += b'\x02' + bytes([len(value)]) + value
+    return b'\x30' + bytes([len(integers)]) + integers
+
+
+class Backend(object):
+    """
+    secp256k1 operations, on 32-byte secrets, 33-byte compressed and 65-byte uncompressed public keys,
+    32-byte digests and 64-byte r || s signatures
+    prepare(secret) returns whatever sign_digest and public_key take as key
+    Signatures are deterministic (RFC 6979) and low S
+    verify_digest accepts high S, and returns False rather than raising for malformed keys, digests or signatures
+    """
+    name = None
+
+    def prepare(self, secret):
+        raise NotImplementedError
+
+    def public_key(self, key):
+        raise NotImplementedError
+
+    def sign_digest(self, key, digest):
+        raise NotImplementedError
+
+    def verify_digest(self, public_key, digest, signature):
+        raise NotImplementedError
+
+    def decompress(self, public_key):
+        return uncompress_key(public_key)
+
+    def compress(self, public_key):
+        return compress_key(public_key)
+
+
+class EcdsaBackend(Backend):
+    name = 'ecdsa'
+
+    def prepare(self, secret):
+        return SigningKey.from_string(secret, curve=SECP256k1)
+
+    def public_key(self, key):
+        return compress_key(b'\x04' + key.get_verifying_key().to_string())
+
+    def sign_digest(self, key, digest):
+        return low_s(key.sign_digest_deterministic(digest, hashfunc=hashlib.sha256))
+
+    def verify_digest(self, public_key, digest, signature):
+        # ecdsa before 0.14 asserts the signature length rather than raising BadSignatureError
+        if len(digest) != 32 or len(signature) != 64:
+            return False
+        try:
+            key = verifying_key(public_key)
+        except (ValueError, AssertionError):
+            # MalformedPointError is an AssertionError
+            return False
+        return key.verify_digest(signature, digest)
+
+
+class PythonBackend(Backend):
+    """
+    Builds a table of multiples of G on first use, in about 0.3 s
+    """
+    name = 'python'
+
+    def prepare(self, secret):
+        exponent = int_from_bytes(secret)
+        if not 0 < exponent < ecc.N:
+            raise ValueError('Secret exponent out of range')
+        return exponent
+
+    def public_key(self, key):
+        return ecc.public_key(key)
+
+    def sign_digest(self, key, digest):
+        return low_s(ecc.sign_digest(key, digest))
+
+    def verify_digest(self, public_key, digest, signature):
+        if len(digest) != 32:
+            return False
+        try:
+            return ecc.verify_digest(public_key, digest, signature)
+        except ValueError:
+            # public keys off the curve
+            return False
+
+    def decompress(self, public_key):
+        x, y = ecc.decode_point(public_key)
+        return b'\x04' + int_to_bytes(x, 32) + int_to_bytes(y, 32)
+
+
+class CoincurveBackend(Backend):
+    name = 'coincurve'
+
+    def prepare(self, secret):
+        return coincurve.PrivateKey(secret)
+
+    def public_key(self, key):
+        return key.public_key.format(compressed=True)
+
+    def sign_digest(self, key, digest):
+        # libsecp256k1 signs low S already
+        return key.sign_recoverable(digest, hasher=None)[:64]
+
+    def verify_digest(self, public_key, digest, signature):
+        # libsecp256k1 rejects high S, which ecdsa accepts
+        if len(signature) != 64:
+            return False
+        try:
+            return coincurve.PublicKey(public_key).verify(der_signature(low_s(signature)), digest, hasher=None)
+        except ValueError:
+            return False
+
+    def decompress(self, public_key):
+        return coincurve.PublicKey(public_key).format(compressed=False)
+
+    def compress(self, public_key):
+        return coincurve.PublicKey(public_key).format(compressed=True)
+
+
+backends = {}
+selected_backend = os.environ.get(BACKEND_VARIABLE) or DEFAULT_BACKEND
+
+
+def register_backend(backend):
+    """
+    Make a Backend selectable by its name, replacing any of the same name
+    """
+    backends[backend.name] = backend
+    return backend
+
+
+def get_backend(name=None):
+    """
+    Backend by name, 'auto' for the fastest available, or None for the selected one
+    Raises ValueError for unknown names
+    """
+    name = name or selected_backend
+    if name == 'auto':
+        name = next(fastest for fastest in FASTEST_BACKENDS if fastest in backends)
+    if name not in backends:
+        raise ValueError('Unknown crypto backend %r, expected one of auto, %s' % (name, ', '.join(sorted(backends))))
+    return backends[name]
+
+
+def use_backend(name):
+    """
+    Select the backend that signing and verification use by default, overriding BNB_TX_CRYPTO_BACKEND
+    """
+    global selected_backend
+    selected_backend = get_backend(name).name
+
+
+register_backend(EcdsaBackend())
+register_backend(PythonBackend())
+if coincurve is not None:
+    register_backend(CoincurveBackend())
+
+
+class PrivateKey(object):
+    """
+    secp256k1 signing key and its compressed public key, prepared once and reused
+    Signatures are deterministic (RFC 6979) and low S, and identical for every backend
+    """
+    __slots__ = ('secret', 'backend', 'key', 'public_key')
+
+    def __init__(self, secret, backend=None):
+        self.secret = secret
+        self.backend = get_backend(backend)
+        self.key = self.backend.prepare(secret)
+        self.public_key = self.backend.public_key(self.key)
+
+    def sign_digest(self, digest):
+        return self.backend.sign_digest(self.key, digest)
+
+
+def private_key(key, backend=None):
+    """
+    PrivateKey from a PrivateKey, an ecdsa SigningKey, a 32-byte secret or a secret exponent
+    backend defaults to that of a PrivateKey, else to the selected one
+    Secrets are not memoized: keep the PrivateKey returned to sign again without preparing the key again
+    """
+    if isinstance(key, PrivateKey):
+        if backend is None or key.backend is get_backend(backend):
+            return key
+        key = key.secret
+    if isinstance(key, SigningKey):
+        key = key.to_string()
+    elif isinstance(key, int):
+        key = int_to_bytes(key, 32)
+    return PrivateKey(bytes(key), backend)
+
+
+def cache_hit_rate(cache_info):
+    lookups = cache_info.hits + cache_info.misses
+    return cache_info.hits / lookups if lookups else 0.0
+
+
+def verify_sig(public_key, digest, signature, curve=SECP256k1, backend=None):
+    """
+    public_key is either compressed or uncompressed
+    backend defaults to the selected one, and other curves than secp256k1 always use ecdsa
+    """
+    if curve is SECP256k1:
+        return get_backend(backend).verify_digest(bytes(public_key), digest, signature)
+    return CachedVerifyingKey(public_key, curve).verify_digest(signature, digest)
@@ -1,4 +1,5 @@
-from binance_transaction.base import Address, Amino, String, VarInt, make_prefix
+from binance_transaction.base import Address, Amino, String, VarInt
+from binance_transaction.schema import Field
 
 
 """
@@ -27,6 +28,14 @@ LIMIT_ORDER = 2
 
 
 class DexList(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'proposal_id', VarInt),
+        Field(3, 'base_asset_symbol', String),
+        Field(4, 'quote_asset_symbol', String),
+        Field(5, 'init_price', VarInt),
+    )
+
     def __init__(self, from_address, proposal_id, base_asset_symbol, quote_asset_symbol, init_price):
         dict.__init__(
             self,
@@ -41,34 +50,6 @@ class DexList(Amino):
     def object_id():
         return bytes.fromhex('B41DE13F')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['proposal_id'].encode(2)
-        buf += self['base_asset_symbol'].encode(3)
-        buf += self['quote_asset_symbol'].encode(4)
-        buf += self['init_price'].encode(5)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        assert data[0:4] == DexList.object_id()
-        data = data[4:]
-        from_address, data = Address.decode(data, 1)
-        proposal_id, data = VarInt.decode(data, 2)
-        base_asset_symbol, data = String.decode(data, 3)
-        quote_asset_symbol, data = String.decode(data, 4)
-        init_price, data = VarInt.decode(data, 5)
-        return DexList(from_address, proposal_id, base_asset_symbol, quote_asset_symbol, init_price)
-
     def from_msg_obj(list_data):
         return DexList(
             list_data['from'],
@@ -80,6 +61,17 @@ class DexList(Amino):
 
 
 class NewOrder(Amino):
+    fields = (
+        Field(1, 'sender', Address),
+        Field(2, 'id', String),
+        Field(3, 'symbol', String),
+        Field(4, 'ordertype', VarInt),
+        Field(5, 'side', VarInt),
+        Field(6, 'price', VarInt),
+        Field(7, 'quantity', VarInt),
+        Field(8, 'timeinforce', VarInt),
+    )
+
     def __init__(self, sender, order_id, symbol, ordertype, side, price, quantity, timeinforce):
         dict.__init__(
             self,
@@ -97,24 +89,6 @@ class NewOrder(Amino):
     def object_id():
         return bytes.fromhex('CE6DC043')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['sender'].encode(1)
-        buf += self['id'].encode(2)
-        buf += self['symbol'].encode(3)
-        buf += self['ordertype'].encode(4)
-        buf += self['side'].encode(5)
-        buf += self['price'].encode(6)
-        buf += self['quantity'].encode(7)
-        buf += self['timeinforce'].encode(8)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(self, field_id=None):
-        pass
-
     @staticmethod
     def from_msg_obj(msg_data):
         return NewOrder(
@@ -130,6 +104,12 @@ class NewOrder(Amino):
 
 
 class CancelOrder(Amino):
+    fields = (
+        Field(1, 'sender', Address),
+        Field(2, 'symbol', String),
+        Field(3, 'refid', String),
+    )
+
     def __init__(self, sender, symbol, refid):
         dict.__init__(self, sender=sender, symbol=symbol, refid=refid)
 
@@ -137,19 +117,6 @@ class CancelOrder(Amino):
     def object_id():
         return bytes.fromhex('166E681B')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['sender'].encode(1)
-        buf += self['symbol'].encode(2)
-        buf += self['refid'].encode(3)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(self):
-        pass
-
     @staticmethod
     def from_msg_obj(cancel_data):
         return CancelOrder(
@@ -0,0 +1,348 @@
+import functools
+import hashlib
+import hmac
+
+
+"""
+ecc.py
+
+Pure Python secp256k1 for hosts without native extensions
+Points are affine (x, y) tuples, or Jacobian (X, Y, Z) with x = X / Z^2, y = Y / Z^3, and None at infinity
+
+k * G adds one precomputed multiple of G per byte of k, with no doublings
+The table holds j * 256^i * G for each of the 32 bytes i and each nonzero byte value j
+It is built on first use, normalized to affine with a single batch inversion
+
+Signatures are deterministic (RFC 6979 with SHA-256), identical to ecdsa's sign_digest_deterministic
+
+Verification computes u1 * G + u2 * Q in one pass of doublings (Straus), with the scalars in wNAF
+The endomorphism splits each scalar in two of half the length, so the pass is 128 doublings long
+Odd multiples of G come from a fixed table, those of Q from a per-key table kept in an LRU cache
+
+* P
+* N
+* G
+* inverse
+* batch_inverse
+* multiply_generator
+* public_key
+* sign_digest
+* decode_point
+* verify_digest
+"""
+
+
+P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+WINDOW = 8
+# wNAF widths: odd multiples up to 2^(width - 1) are tabulated
+G_WNAF_WIDTH = 8
+KEY_WNAF_WIDTH = 5
+KEY_TABLE_CACHE_SIZE = 4096
+# endomorphism LAMBDA * (x, y) = (BETA * x, y), and a short basis of the lattice of (a, b) with a + b * LAMBDA = 0 mod N
+LAMBDA = 0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72
+BETA = 0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE
+A1 = 0x3086D221A7D46BCDE86C90E49284EB15
+B1 = -0xE4437ED6010E88286F547FA90ABFE4C3
+A2 = 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+B2 = A1
+
+
+try:
+    pow(2, -1, 3)
+
+    def inverse(x, modulus):
+        return pow(x, -1, modulus)
+except ValueError:
+    # before Python 3.8, both moduli are prime
+    def inverse(x, modulus):
+        return pow(x, modulus - 2, modulus)
+
+
+def batch_inverse(values, modulus):
+    """
+    Montgomery's trick: every inverse for the price of one and 3(n - 1) multiplications
+    """
+    prefix = []
+    product = 1
+    for value in values:
+        prefix.append(product)
+        product = product * value % modulus
+    running = inverse(product, modulus)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = running * prefix[i] % modulus
+        running = running * values[i] % modulus
+    return inverses
+
+
+def double(point):
+    if point is None:
+        return None
+    x, y, z = point
+    if y == 0:
+        return None
+    yy = y * y % P
+    s = 4 * x * yy % P
+    m = 3 * x * x % P
+    x3 = (m * m - 2 * s) % P
+    return x3, (m * (s - x3) - 8 * yy * yy) % P, 2 * y * z % P
+
+
+def add_affine(point, affine):
+    """
+    Jacobian point + affine point
+    """
+    if point is None:
+        return affine[0], affine[1], 1
+    x1, y1, z1 = point
+    x2, y2 = affine
+    zz = z1 * z1 % P
+    h = (x2 * zz - x1) % P
+    r = (y2 * zz * z1 - y1) % P
+    if h == 0:
+        return double(point) if r == 0 else None
+    hh = h * h % P
+    hhh = h * hh % P
+    v = x1 * hh % P
+    x3 = (r * r - hhh - 2 * v) % P
+    return x3, (r * (v - x3) - y1 * hhh) % P, z1 * h % P
+
+
+def to_affine(point):
+    x, y, z = point
+    z_inverse = inverse(z, P)
+    zz = z_inverse * z_inverse % P
+    return x * zz % P, y * zz * z_inverse % P
+
+
+def batch_to_affine(points):
+    inverses = batch_inverse([z for x, y, z in points], P)
+    affine = []
+    for (x, y, z), z_inverse in zip(points, inverses):
+        zz = z_inverse * z_inverse % P
+        affine.append((x * zz % P, y * zz * z_inverse % P))
+    return affine
+
+
+generator_table = []
+
+
+def build_generator_table():
+    """
+    generator_table[i][j - 1] is j * 256^i * G
+    """
+    size = 1 << WINDOW
+    base = G
+    points = []
+    for window in range(256 // WINDOW):
+        point = None
+        for multiple in range(1, size):
+            point = add_affine(point, base)
+            points.append(point)
+        base = to_affine(add_affine(point, base))
+    affine = batch_to_affine(points)
+    return [affine[start:start + size - 1] for start in range(0, len(affine), size - 1)]
+
+
+def multiply_generator(k):
+    """
+    k * G as an affine point, or None at infinity
+    """
+    if not generator_table:
+        generator_table.extend(build_generator_table())
+    k %= N
+    point = None
+    mask = (1 << WINDOW) - 1
+    for window in generator_table:
+        digit = k & mask
+        if digit:
+            point = add_affine(point, window[digit - 1])
+        k >>= WINDOW
+    if point is None:
+        return None
+    return to_affine(point)
+
+
+def public_key(secret):
+    """
+    Compressed public key for a secret exponent
+    """
+    x, y = multiply_generator(secret)
+    return bytes([2 + (y & 1)]) + x.to_bytes(32, 'big')
+
+
+def nonces(secret, digest):
+    """
+    RFC 6979 candidate nonces for SHA-256 and a 256-bit order
+    """
+    x = secret.to_bytes(32, 'big')
+    h = (int.from_bytes(digest, 'big') % N).to_bytes(32, 'big')
+    v = b'\x01' * 32
+    k = b'\x00' * 32
+    k = hmac.new(k, v + b'\x00' + x + h, hashlib.sha256).digest()
+    v = hmac.new(k, v, hashlib.sha256).digest()
+    k = hmac.new(k, v + b'\x01' + x + h, hashlib.sha256).digest()
+    v = hmac.new(k, v, hashlib.sha256).digest()
+    while True:
+        v = hmac.new(k, v, hashlib.sha256).digest()
+        candidate = int.from_bytes(v, 'big')
+        if 1 <= candidate < N:
+            yield candidate
+        k = hmac.new(k, v + b'\x00', hashlib.sha256).digest()
+        v = hmac.new(k, v, hashlib.sha256).digest()
+
+
+def sign_digest(secret, digest):
+    """
+    64-byte r || s signature of a 32-byte digest
+    """
+    e = int.from_bytes(digest, 'big')
+    for k in nonces(secret, digest):
+        point = multiply_generator(k)
+        r = point[0] % N
+        if r == 0:
+            continue
+        s = inverse(k, N) * (e + r * secret) % N
+        if s == 0:
+            continue
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+
+
+def decode_point(public_key):
+    """
+    Affine point of a 33-byte compressed or 65-byte uncompressed public key
+    Raises ValueError for points off the curve
+    """
+    if len(public_key) == 33 and public_key[0] in (2, 3):
+        x = int.from_bytes(public_key[1:], 'big')
+        y = pow((pow(x, 3, P) + 7) % P, (P + 1) // 4, P)
+        if y & 1 != public_key[0] & 1:
+            y = P - y
+    elif len(public_key) == 65 and public_key[0] == 4:
+        x = int.from_bytes(public_key[1:33], 'big')
+        y = int.from_bytes(public_key[33:], 'big')
+    else:
+        raise ValueError('Expected a 33-byte compressed or 65-byte uncompressed public key')
+    if x >= P or y >= P or (y * y - x * x * x - 7) % P != 0:
+        raise ValueError('Public key is not on secp256k1')
+    return x, y
+
+
+def odd_multiples(point, width):
+    """
+    point, 3 * point, ..., (2^(width - 1) - 1) * point, as affine points
+    """
+    twice = to_affine(double((point[0], point[1], 1)))
+    multiples = [(point[0], point[1], 1)]
+    for _ in range((1 << (width - 2)) - 1):
+        multiples.append(add_affine(multiples[-1], twice))
+    return batch_to_affine(multiples)
+
+
+def endomorphism(points):
+    """
+    LAMBDA * point for each point, which costs one multiplication: LAMBDA * (x, y) = (BETA * x, y)
+    """
+    return [(BETA * x % P, y) for x, y in points]
+
+
+def split_scalar(k):
+    """
+    k1, k2 of about 128 bits each, with k1 + k2 * LAMBDA = k mod N
+    """
+    c1 = (B2 * k + N // 2) // N
+    c2 = (-B1 * k + N // 2) // N
+    return k - c1 * A1 - c2 * A2, -c1 * B1 - c2 * B2
+
+
+def wnaf(k, width):
+    """
+    Signed digits of k, least significant first: each nonzero digit is odd and below 2^(width - 1) in size,
+    and is followed by at least width - 1 zeros
+    """
+    digits = []
+    window = 1 << width
+    half = window >> 1
+    while k:
+        if k & 1:
+            digit = k & (window - 1)
+            if digit >= half:
+                digit -= window
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        k >>= 1
+    return digits
+
+
+generator_multiples = []
+
+
+@functools.lru_cache(maxsize=KEY_TABLE_CACHE_SIZE)
+def key_multiples(public_key):
+    """
+    Odd multiples of a public key and of LAMBDA times it
+    See key_multiples.cache_info() for hits and misses
+    """
+    multiples = odd_multiples(decode_point(public_key), KEY_WNAF_WIDTH)
+    return multiples, endomorphism(multiples)
+
+
+def schedule(additions, k, width, multiples):
+    """
+    Add the points of k's wNAF digits to additions, by bit position
+    """
+    sign = -1 if k < 0 else 1
+    for position, digit in enumerate(wnaf(abs(k), width)):
+        if digit:
+            x, y = multiples[abs(digit) >> 1]
+            additions[position].append((x, y) if digit * sign > 0 else (x, P - y))
+
+
+def verify_digest(public_key, digest, signature):
+    """
+    Check a 64-byte r || s signature of a digest against a public key, in either encoding
+    """
+    if len(signature) != 64:
+        return False
+    r = int.from_bytes(signature[:32], 'big')
+    s = int.from_bytes(signature[32:], 'big')
+    if not (0 < r < N and 0 < s < N):
+        return False
+    if not generator_multiples:
+        multiples = odd_multiples(G, G_WNAF_WIDTH)
+        generator_multiples.extend((multiples, endomorphism(multiples)))
+    key, key_endomorphism = key_multiples(bytes(public_key))
+    w = inverse(s, N)
+    g1, g2 = split_scalar(int.from_bytes(digest, 'big') * w % N)
+    q1, q2 = split_scalar(r * w % N)
+    # 130 bits hold the split scalars and their wNAF carry
+    additions = [[] for _ in range(130)]
+    schedule(additions, g1, G_WNAF_WIDTH, generator_multiples[0])
+    schedule(additions, g2, G_WNAF_WIDTH, generator_multiples[1])
+    schedule(additions, q1, KEY_WNAF_WIDTH, key)
+    schedule(additions, q2, KEY_WNAF_WIDTH, key_endomorphism)
+    point = None
+    for points in reversed(additions):
+        if point is not None:
+            # double, inlined: a = 0 on secp256k1, and no point has y = 0
+            x, y, z = point
+            yy = y * y % P
+            t = 4 * x * yy % P
+            m = 3 * x * x % P
+            x = (m * m - 2 * t) % P
+            point = x, (m * (t - x) - 8 * yy * yy) % P, 2 * y * z % P
+        for affine in points:
+            point = add_affine(point, affine)
+    if point is None:
+        return False
+    # compare x without leaving Jacobian coordinates: x = X / Z^2 mod P, then reduced mod N
+    x, y, z = point
+    zz = z * z % P
+    return x == r * zz % P or (r + N < P and x == (r + N) * zz % P)
@@ -1,2 +1,6 @@
 class UnsupportedBnbMessage(Exception):
     pass
+
+
+class AminoDecodeError(Exception):
+    pass
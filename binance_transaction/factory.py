@@ -0,0 +1,95 @@
+from binance_transaction.base import Bytes, String, VarInt, make_prefix
+from binance_transaction.bnb_transaction import BnbTransaction
+from binance_transaction.canonical import write_value
+from binance_transaction.crypto import private_key
+from binance_transaction.signature import PubKeySecp256k1
+from binance_transaction.varint import varint_bytes
+
+import base64
+import hashlib
+
+
+"""
+factory.py
+
+Signed, encoded transactions for one account, from a sequence and messages
+Everything else in the transaction and its signature is encoded once up front
+
+* AccountTxFactory
+"""
+
+
+class AccountTxFactory(object):
+    """
+    Stamps out the bytes of transaction(account_number, sequence, source) with memo, data and msgs,
+    signed with key, which is anything crypto.private_key accepts
+    """
+    def __init__(self, key, account_number, source='887', transaction=BnbTransaction, memo='', data=None):
+        self.key = private_key(key)
+        self.account_number = int(account_number)
+        self.transaction = transaction
+        prototype = transaction(account_number, 0, source)
+        prototype['memo'] = memo
+        if data is not None:
+            prototype['data'] = Bytes(data)
+        self.prototype = prototype
+        self.signing_state = hashlib.sha256(prototype.signing_prefix())
+        source_json = []
+        write_value(prototype['source'], source_json)
+        self.signing_tail = '","source":' + ''.join(source_json) + '}'
+        self.object_id = transaction.object_id()
+        self.signature_head = (
+            PubKeySecp256k1(base64.b64encode(self.key.public_key).decode('utf8')).encode(1)
+            + make_prefix(2, 2) + varint_bytes(64)
+        )
+        self.signature_tail = VarInt(self.account_number).encode(3)
+        buf = bytearray()
+        String.encode_into(prototype['memo'], buf, 3)
+        prototype['source'].encode_into(buf, 4)
+        if prototype['data'] is not None:
+            prototype['data'].encode_into(buf, 5)
+        self.tail = bytes(buf)
+
+    def signing_json(self, sequence, msgs):
+        return self.prototype.signing_prefix() + self.signing_suffix(sequence, msgs)
+
+    def signing_suffix(self, sequence, msgs):
+        parts = []
+        write_value(msgs, parts)
+        parts.append(',"sequence":"%d' % sequence)
+        parts.append(self.signing_tail)
+        return ''.join(parts).encode('utf8')
+
+    def signing_hash(self, sequence, msgs):
+        state = self.signing_state.copy()
+        state.update(self.signing_suffix(sequence, msgs))
+        return state.digest()
+
+    def encode(self, sequence, msgs):
+        """
+        The same bytes as transaction(...).sign(key).encode()
+        """
+        sequence = int(sequence)
+        if sequence < 0:
+            raise ValueError('Negative sequence %d' % sequence)
+        signature = self.key.sign_digest(self.signing_hash(sequence, msgs))
+        signature = self.signature_head + signature + self.signature_tail + VarInt(sequence).encode(4)
+        body = bytearray(self.object_id)
+        for msg in msgs:
+            msg.encode_into(body, 1)
+        body += make_prefix(2, 2)
+        body += varint_bytes(len(signature))
+        body += signature
+        body += self.tail
+        return varint_bytes(len(body)) + body
+
+    def build(self, sequence, msgs):
+        """
+        The signed transaction itself, for when the object is wanted rather than its bytes
+        """
+        tx = self.transaction(self.account_number, sequence, self.prototype['source'])
+        tx['memo'] = self.prototype['memo']
+        tx['data'] = self.prototype['data']
+        for msg in msgs:
+            tx.add_msg(msg)
+        return tx.sign(self.key)
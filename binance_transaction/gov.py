@@ -1,6 +1,7 @@
-from binance_transaction.base import (
-    Amino, Repeated, String, Address, StringVarInt, StringToken, Token, VarInt, make_prefix
-)
+from binance_transaction.base import Amino, Repeated, String, Address, StringVarInt, StringToken, VarInt, as_repeated
+from binance_transaction.exceptions import AminoDecodeError
+from binance_transaction.schema import Field
+from binance_transaction.varint import read_varint
 
 
 """
@@ -21,17 +22,57 @@ proposal_type_to_int = {
     'ListTradingPair': 4,
     'FeeChange': 5,
 }
+int_to_proposal_type = {value: key for key, value in proposal_type_to_int.items()}
+
+
+class ProposalType(String):
+    """
+    A String enum for JSON, a VarInt for encoding
+    """
+    wire_type = 0
+
+    def encode(self, field_id=None):
+        return VarInt.encode(proposal_type_to_int[self], field_id)
+
+    def encode_into(self, buf, field_id=None):
+        VarInt.encode_into(proposal_type_to_int[self], buf, field_id)
+
+    def encoded_size(self, field_id=None):
+        return VarInt.encoded_size(proposal_type_to_int[self], field_id)
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        if value not in int_to_proposal_type:
+            raise AminoDecodeError('Unknown proposal type %d at offset %d' % (value, pos))
+        return klass(int_to_proposal_type[value]), pos
+
+    @staticmethod
+    def read_raw(data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        if value not in int_to_proposal_type:
+            raise AminoDecodeError('Unknown proposal type %d at offset %d' % (value, pos))
+        return int_to_proposal_type[value], pos
 
 
 class Proposal(Amino):
+    fields = (
+        Field(1, 'title', String),
+        Field(2, 'description', String),
+        Field(3, 'proposal_type', ProposalType),
+        Field(4, 'proposer', Address),
+        Field(5, 'initial_deposit', StringToken, repeated=True),
+        Field(6, 'voting_period', StringVarInt),
+    )
+
     def __init__(self, title, description, proposal_type, proposer, initial_deposit, voting_period):
         dict.__init__(
             self,
             title=String(title),
             description=String(description),
-            proposal_type=String(proposal_type),
+            proposal_type=ProposalType(proposal_type),
             proposer=Address(proposer),
-            initial_deposit=initial_deposit,
+            initial_deposit=as_repeated(initial_deposit),
             voting_period=StringVarInt(voting_period)
         )
 
@@ -39,37 +80,6 @@ class Proposal(Amino):
     def object_id():
         return bytes.fromhex('B42D614E')
 
-    def encode(self, field_id=None):
-        # buf = bytes.fromhex('ACCBA2DE')
-        buf = self.object_id()
-        buf += self['title'].encode(1)
-        buf += self['description'].encode(2)
-        buf += VarInt(proposal_type_to_int[self['proposal_type']]).encode(3)
-        buf += self['proposer'].encode(4)
-        buf += self['initial_deposit'].encode(5)
-        buf += self['voting_period'].encode(6)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        assert data[0:4] == Proposal.object_id()
-        data = data[4:]
-        title, data = String.decode(data, 1)
-        description, data = String.decode(data, 2)
-        proposal_type, data = VarInt.decode(data, 3)
-        proposer, data = Address.decode(data, 4)
-        initial_deposit, data = Repeated.decode(data, 5, Token)
-        voting_period, data = StringVarInt.decode(data, 6)
-        return Proposal(title, description, proposal_type, proposer, initial_deposit, voting_period)
-
     @staticmethod
     def from_msg_obj(proposal_data):
         initial_deposit = Repeated([])
@@ -91,6 +101,7 @@ vote_option_to_varint = {
     "No": VarInt(3),
     "NoWithVeto": VarInt(4)
 }
+varint_to_vote_option = {value: key for key, value in vote_option_to_varint.items()}
 
 
 class VoteOption(String):
@@ -100,8 +111,36 @@ class VoteOption(String):
     def encode(self, field_id=None):
         return VarInt.encode(vote_option_to_varint[self], field_id)
 
+    wire_type = 0
+
+    def encode_into(self, buf, field_id=None):
+        VarInt.encode_into(vote_option_to_varint[self], buf, field_id)
+
+    def encoded_size(self, field_id=None):
+        return VarInt.encoded_size(vote_option_to_varint[self], field_id)
+
+    @classmethod
+    def read(klass, data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        if value not in varint_to_vote_option:
+            raise AminoDecodeError('Unknown vote option %d at offset %d' % (value, pos))
+        return klass(varint_to_vote_option[value]), pos
+
+    @staticmethod
+    def read_raw(data, pos, end, hrp='bnb'):
+        value, pos = read_varint(data, pos, end)
+        if value not in varint_to_vote_option:
+            raise AminoDecodeError('Unknown vote option %d at offset %d' % (value, pos))
+        return varint_to_vote_option[value], pos
+
 
 class Vote(Amino):
+    fields = (
+        Field(1, 'proposal_id', StringVarInt),
+        Field(2, 'voter', Address),
+        Field(3, 'option', VoteOption),
+    )
+
     def __init__(self, proposal_id, voter, option):
         dict.__init__(
             self,
@@ -114,16 +153,6 @@ class Vote(Amino):
     def object_id():
         return bytes.fromhex('A1CADD36')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['proposal_id'].encode(1)
-        buf += self['voter'].encode(2)
-        buf += self['option'].encode(3)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
     @staticmethod
     def from_msg_obj(vote_data):
         return Vote(
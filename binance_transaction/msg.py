@@ -1,4 +1,5 @@
-from binance_transaction.base import Amino, make_prefix
+from binance_transaction.base import Amino
+from binance_transaction.exceptions import AminoDecodeError, UnsupportedBnbMessage
 from binance_transaction.token import Send, Issue, Mint, Burn, Freeze, Unfreeze, TimeLock, TimeRelock, TimeUnlock
 from binance_transaction.gov import Proposal, Vote
 from binance_transaction.dex import DexList, NewOrder, CancelOrder
@@ -9,6 +10,7 @@ msg.py
 
 All message types are documented in this file to support decoding
 
+read_msg_class
 Msg
 """
 
@@ -49,12 +51,30 @@ msg_class_by_object_id = {
 }
 
 
+msg_type_by_class = {msg_klass: msg_type for msg_type, msg_klass in msg_class_by_type.items()}
+
+
+def read_msg_class(data, pos, end):
+    """
+    The message class for the object id at data[pos]
+    A body too short to hold an object id is a decode error, not an unknown message
+    """
+    if pos + 4 > end:
+        raise AminoDecodeError('Truncated object id at offset %d' % pos)
+    object_id = bytes(data[pos:pos + 4])
+    if object_id not in msg_class_by_object_id:
+        raise UnsupportedBnbMessage(object_id.hex().upper())
+    return msg_class_by_object_id[object_id]
+
+
 class Msg(Amino):
     @staticmethod
-    def decode(data, field_id):
-        prefix = make_prefix(field_id, 2)
-        object_id = data[len(prefix):len(prefix) + 4]
-        return msg_class_by_object_id[object_id].decode(data, prefix)
+    def read_body(data, pos, end, hrp='bnb'):
+        return read_msg_class(data, pos, end).read_body(data, pos, end, hrp)
+
+    @staticmethod
+    def read_record_body(data, pos, end, hrp='bnb'):
+        return read_msg_class(data, pos, end).read_record_body(data, pos, end, hrp)
 
     @staticmethod
     def from_msg_obj(msg_obj):
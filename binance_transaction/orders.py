@@ -0,0 +1,220 @@
+from binance_transaction.base import Address, String, VarInt, make_prefix
+from binance_transaction.bech32 import address_bytes
+from binance_transaction.dex import GTE, LIMIT_ORDER, CancelOrder, NewOrder
+from binance_transaction.varint import varint_bytes
+
+from json.encoder import encode_basestring_ascii
+
+
+"""
+orders.py
+
+Order flow for one sender and symbol, with the constant fields encoded once
+
+* OrderTemplate
+* OrderRegistry
+"""
+
+
+new_message = dict.__new__
+init_message = dict.__init__
+
+
+def varint_field(prefix, value):
+    """
+    Amino omits zero values
+    """
+    if value == 0:
+        return b''
+    if value < 0:
+        raise ValueError('Negative value %d' % value)
+    return prefix + varint_bytes(value)
+
+
+class OrderTemplate(object):
+    """
+    NewOrder messages sharing sender, symbol, ordertype and timeinforce, and differing in id, side, price and quantity
+    The messages come with their amino encoding and signing JSON already written
+    """
+    def __init__(self, sender, symbol, ordertype=LIMIT_ORDER, timeinforce=GTE, registry=None):
+        """
+        Orders are recorded in registry, an OrderRegistry, if there is one
+        """
+        self.registry = registry
+        self.sender = Address(sender)
+        self.symbol = String(symbol)
+        self.ordertype = VarInt(ordertype)
+        self.timeinforce = VarInt(timeinforce)
+        self.id_prefix = address_bytes(sender).hex().upper() + '-'
+        self.head = NewOrder.object_id() + self.sender.encode(1)
+        self.middle = self.symbol.encode(3) + self.ordertype.encode(4)
+        self.side_prefix = make_prefix(5, 0)
+        self.price_prefix = make_prefix(6, 0)
+        self.quantity_prefix = make_prefix(7, 0)
+        self.tail = self.timeinforce.encode(8)
+        self.json_middle = ',"ordertype":%d,"price":' % self.ordertype
+        self.json_sender = ',"sender":' + encode_basestring_ascii(self.sender) + ',"side":'
+        self.json_tail = ',"symbol":' + encode_basestring_ascii(self.symbol) + ',"timeinforce":%d}' % self.timeinforce
+
+    def order_id(self, sequence):
+        """
+        The standard id of the order in the transaction with this sequence: sender address in hex, then sequence + 1
+        """
+        return '%s%d' % (self.id_prefix, sequence + 1)
+
+    def order(self, side, price, quantity, order_id):
+        """
+        A NewOrder, equal to NewOrder(sender, order_id, symbol, ordertype, side, price, quantity, timeinforce)
+        """
+        side, price, quantity = int(side), int(price), int(quantity)
+        order_id = String(order_id)
+        order = new_message(NewOrder)
+        init_message(
+            order,
+            sender=self.sender,
+            id=order_id,
+            symbol=self.symbol,
+            ordertype=self.ordertype,
+            side=VarInt(side),
+            price=VarInt(price),
+            quantity=VarInt(quantity),
+            timeinforce=self.timeinforce,
+        )
+        order._encoded = b''.join((
+            self.head,
+            String.encode(order_id, 2),
+            self.middle,
+            varint_field(self.side_prefix, side),
+            varint_field(self.price_prefix, price),
+            varint_field(self.quantity_prefix, quantity),
+            self.tail,
+        ))
+        order._json = ''.join((
+            '{"id":', encode_basestring_ascii(order_id), self.json_middle, str(price), ',"quantity":', str(quantity),
+            self.json_sender, str(side), self.json_tail,
+        ))
+        if self.registry is not None:
+            self.registry.add(order)
+        return order
+
+    def next_order(self, side, price, quantity, sequence):
+        """
+        An order with the standard id, for the transaction with this sequence
+        """
+        return self.order(side, price, quantity, self.order_id(sequence))
+
+
+class CancelFragments(object):
+    """
+    The constant parts of CancelOrder messages for one sender and symbol
+    """
+    __slots__ = ('sender', 'symbol', 'head', 'json_tail')
+
+    def __init__(self, sender, symbol):
+        self.sender = Address(sender)
+        self.symbol = String(symbol)
+        self.head = CancelOrder.object_id() + self.sender.encode(1) + self.symbol.encode(2)
+        self.json_tail = ''.join((
+            ',"sender":', encode_basestring_ascii(self.sender), ',"symbol":', encode_basestring_ascii(self.symbol), '}'
+        ))
+
+    def cancel(self, order_id):
+        refid = String(order_id)
+        message = new_message(CancelOrder)
+        init_message(message, sender=self.sender, symbol=self.symbol, refid=refid)
+        message._encoded = self.head + String.encode(refid, 3)
+        message._json = '{"refid":' + encode_basestring_ascii(refid) + self.json_tail
+        return message
+
+
+class OrderRegistry(object):
+    """
+    Open orders by id, and by symbol and side, in the order they were added
+    Cancels come with their amino encoding and signing JSON already written,
+    from sender and symbol fragments encoded once per pair
+    Cancelling does not remove orders: remove them once the cancel, or a fill, is confirmed
+    Orders stay indexed under the symbol and side they had when added: add one again after changing either
+    """
+    def __init__(self):
+        self.by_id = {}
+        # symbol -> side -> id -> order
+        self.by_symbol = {}
+        # id -> (symbol, side) the order is indexed under
+        self.index_keys = {}
+        # (sender, symbol) -> CancelFragments
+        self.fragments = {}
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, order_id):
+        return order_id in self.by_id
+
+    def __getitem__(self, order_id):
+        return self.by_id[order_id]
+
+    def add(self, order):
+        """
+        Record a NewOrder, replacing any with the same id
+        """
+        order_id = order['id']
+        if order_id in self.by_id:
+            self.remove(order_id)
+        symbol, side = order['symbol'], int(order['side'])
+        self.by_id[order_id] = order
+        self.index_keys[order_id] = (symbol, side)
+        self.by_symbol.setdefault(symbol, {}).setdefault(side, {})[order_id] = order
+        return order
+
+    def remove(self, order_id):
+        """
+        Forget an order, returning it, or None if it is not open
+        """
+        order = self.by_id.pop(order_id, None)
+        if order is None:
+            return None
+        symbol, side = self.index_keys.pop(order_id)
+        sides = self.by_symbol[symbol]
+        orders = sides[side]
+        del orders[order_id]
+        if not orders:
+            del sides[side]
+            if not sides:
+                del self.by_symbol[symbol]
+        return order
+
+    def orders(self, symbol=None, side=None):
+        """
+        Open orders, optionally only those for symbol, and on one side of its book
+        """
+        if symbol is None:
+            if side is None:
+                return list(self.by_id.values())
+            return [order for order_id, order in self.by_id.items() if self.index_keys[order_id][1] == side]
+        sides = self.by_symbol.get(symbol, {})
+        if side is None:
+            return [order for orders in sides.values() for order in orders.values()]
+        return list(sides.get(side, {}).values())
+
+    def cancel_fragments(self, sender, symbol):
+        key = (sender, symbol)
+        fragments = self.fragments.get(key)
+        if fragments is None:
+            fragments = self.fragments[key] = CancelFragments(sender, symbol)
+        return fragments
+
+    def cancel(self, order_id):
+        """
+        CancelOrder for an open order, raising KeyError for an unknown id
+        """
+        order = self.by_id[order_id]
+        return self.cancel_fragments(order['sender'], order['symbol']).cancel(order_id)
+
+    def cancel_all(self, symbol=None, side=None):
+        """
+        CancelOrder messages for every open order, optionally only those for symbol, and on one side of its book
+        """
+        cancels = []
+        for order in self.orders(symbol, side):
+            cancels.append(self.cancel_fragments(order['sender'], order['symbol']).cancel(order['id']))
+        return cancels
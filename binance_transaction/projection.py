@@ -0,0 +1,123 @@
+from binance_transaction.bnb_transaction import BnbTransaction
+from binance_transaction.exceptions import AminoDecodeError, UnsupportedBnbMessage
+from binance_transaction.msg import msg_class_by_object_id, msg_class_by_type, msg_type_by_class
+from binance_transaction.varint import read_varint
+from binance_transaction.wire import read_length, read_object_id
+
+import functools
+
+
+"""
+projection.py
+
+Pull selected message fields out of encoded transactions without decoding the rest
+Paths name JSON fields, with dots for nested ones: 'from', 'symbol', 'inputs.coins.denom'
+Fields a message does not have are left out, and unselected fields are skipped by length
+
+* project
+"""
+
+
+# plans are keyed on (message class, paths), and callers may build paths on the fly
+PLAN_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_plan(klass, paths):
+    """
+    Returns {prefix: (field, plan or None)}
+    A path naming a nested field without going further selects all of its fields
+    """
+    index = {field.name: field for field in klass.fields}
+    nested = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        if name not in index:
+            continue
+        if index[name].nested:
+            if rest == '' or nested.get(name) == ():
+                nested[name] = ()
+            else:
+                nested[name] = nested.get(name, ()) + (rest,)
+        else:
+            nested[name] = None
+    plan = {}
+    for name, rest in nested.items():
+        field = index[name]
+        if rest is None:
+            plan[field.prefix] = (field, None)
+        else:
+            plan[field.prefix] = (field, compile_plan(field.klass, rest or all_paths(field.klass)))
+    return plan
+
+
+def all_paths(klass):
+    return tuple(field.name for field in klass.fields)
+
+
+def extract(plan, data, pos, end, hrp):
+    values = {}
+    while pos < end:
+        prefix = data[pos]
+        entry = plan.get(prefix)
+        if entry is None:
+            if prefix & 7 == 0:
+                pos = read_varint(data, pos + 1, end)[1]
+            elif prefix & 7 == 2:
+                pos = read_length(data, pos + 1, end)[1]
+            else:
+                raise AminoDecodeError('Unexpected wire type %d at offset %d' % (prefix & 7, pos))
+            continue
+        field, nested = entry
+        if nested is None:
+            raw, pos = field.klass.read_raw(data, pos + 1, end, hrp)
+            value = field.klass.from_raw(raw, hrp)
+        else:
+            start, pos = read_length(data, pos + 1, end)
+            if hasattr(field.klass, 'object_id'):
+                start = read_object_id(data, start, pos, field.klass.object_id())
+            value = extract(nested, data, start, pos, hrp)
+        if field.repeated:
+            values.setdefault(field.name, []).append(value)
+        else:
+            values[field.name] = value
+    for field, nested in plan.values():
+        # amino omits default values
+        if field.name in values:
+            continue
+        if field.repeated:
+            values[field.name] = []
+        elif nested is None:
+            values[field.name] = field.klass.from_raw(field.klass.raw_default, hrp)
+        else:
+            values[field.name] = None
+    return values
+
+
+def project(data, paths, msg_types=None, transaction=BnbTransaction):
+    """
+    Returns a dict for each message in the encoded transaction, holding its 'type' and the selected fields
+    msg_types restricts the result to messages of those types, such as 'cosmos-sdk/Send'
+    Values are the same types a full decode returns, with nested messages as plain dicts
+    """
+    paths = tuple(paths)
+    wanted = None if msg_types is None else set(msg_class_by_type[msg_type] for msg_type in msg_types)
+    hrp = transaction.hrp()
+    view = memoryview(data)
+    pos, end = read_length(view, 0, len(view))
+    pos = read_object_id(view, pos, end, transaction.object_id())
+    projected = []
+    while pos < end and view[pos] == 1 << 3 | 2:
+        start, pos = read_length(view, pos + 1, end)
+        if start + 4 > pos:
+            raise AminoDecodeError('Truncated object id at offset %d' % start)
+        object_id = bytes(view[start:start + 4])
+        klass = msg_class_by_object_id.get(object_id)
+        if wanted is not None and klass not in wanted:
+            continue
+        if klass is None:
+            raise UnsupportedBnbMessage(object_id.hex().upper())
+        values = extract(compile_plan(klass, paths), view, start + 4, pos, hrp)
+        values['type'] = msg_type_by_class[klass]
+        projected.append(values)
+    return projected
@@ -0,0 +1,103 @@
+import hashlib
+import struct
+
+
+"""
+ripemd160.py
+
+RIPEMD-160, for addresses
+hashlib only provides it when OpenSSL does, which OpenSSL 3 leaves to its legacy provider
+https://homes.esat.kuleuven.be/~bosselae/ripemd160.html
+
+* ripemd160
+"""
+
+
+# message word order, rotations and constants for the left and right lines, round by round
+LEFT_WORDS = [
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+    4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13,
+]
+RIGHT_WORDS = [
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+    12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11,
+]
+LEFT_ROTATIONS = [
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+    9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6,
+]
+RIGHT_ROTATIONS = [
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+    8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11,
+]
+LEFT_CONSTANTS = [0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E]
+RIGHT_CONSTANTS = [0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000]
+MASK = 0xFFFFFFFF
+
+
+def boolean(round_number, x, y, z):
+    if round_number == 0:
+        return x ^ y ^ z
+    if round_number == 1:
+        return (x & y) | (~x & z)
+    if round_number == 2:
+        return (x | ~y) ^ z
+    if round_number == 3:
+        return (x & z) | (y & ~z)
+    return x ^ (y | ~z)
+
+
+def rotate(x, n):
+    return (x << n | x >> (32 - n)) & MASK
+
+
+def compress(state, block):
+    words = struct.unpack('<16L', block)
+    al, bl, cl, dl, el = state
+    ar, br, cr, dr, er = state
+    for j in range(80):
+        round_number = j >> 4
+        t = al + boolean(round_number, bl, cl, dl) + words[LEFT_WORDS[j]] + LEFT_CONSTANTS[round_number]
+        t = (rotate(t & MASK, LEFT_ROTATIONS[j]) + el) & MASK
+        al, bl, cl, dl, el = el, t, bl, rotate(cl, 10), dl
+        t = ar + boolean(4 - round_number, br, cr, dr) + words[RIGHT_WORDS[j]] + RIGHT_CONSTANTS[round_number]
+        t = (rotate(t & MASK, RIGHT_ROTATIONS[j]) + er) & MASK
+        ar, br, cr, dr, er = er, t, br, rotate(cr, 10), dr
+    return [
+        (state[1] + cl + dr) & MASK,
+        (state[2] + dl + er) & MASK,
+        (state[3] + el + ar) & MASK,
+        (state[4] + al + br) & MASK,
+        (state[0] + bl + cr) & MASK,
+    ]
+
+
+def python_ripemd160(data):
+    state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+    padded = data + b'\x80' + b'\x00' * ((55 - len(data)) % 64) + struct.pack('<Q', len(data) * 8)
+    for start in range(0, len(padded), 64):
+        state = compress(state, padded[start:start + 64])
+    return struct.pack('<5L', *state)
+
+
+def openssl_ripemd160(data):
+    return hashlib.new('ripemd160', data).digest()
+
+
+try:
+    openssl_ripemd160(b'')
+    ripemd160 = openssl_ripemd160
+except ValueError:
+    ripemd160 = python_ripemd160
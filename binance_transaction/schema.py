@@ -0,0 +1,242 @@
+from collections import namedtuple
+from json.encoder import encode_basestring_ascii
+
+from binance_transaction.canonical import write_mapping, write_value
+from binance_transaction.compact import Record, slot_name
+from binance_transaction.varint import varint_size
+from binance_transaction.wire import begin_message, check_end, end_message, read_object_id, write_message
+
+
+"""
+schema.py
+
+Declarative amino field tables
+Each message lists its fields once, and compile_schema turns the table into
+straight-line encode_into, encoded_size, read_body, read_record_body and write_json methods when the class is created
+
+* Field
+* compile_schema
+"""
+
+
+class Field(namedtuple('Field', ['number', 'name', 'klass', 'wire_type', 'repeated'])):
+    """
+    Field number, JSON name, Python type and its wire type
+    """
+    __slots__ = ()
+
+    def __new__(cls, number, name, klass, repeated=False):
+        if not 0 < number < 16:
+            raise ValueError('Field %s: only single-byte field prefixes are supported' % name)
+        return super(Field, cls).__new__(cls, number, name, klass, klass.wire_type, repeated)
+
+    @property
+    def prefix(self):
+        return self.number << 3 | self.wire_type
+
+    @property
+    def nested(self):
+        """
+        Nested messages encode themselves, while scalars such as Address also encode plain str values
+        """
+        return issubclass(self.klass, dict)
+
+
+def compile_encoder(klass, fields, namespace):
+    """
+    Registered messages (those with an object id) keep their encoded body until they are mutated
+    Containers adopt their children as they encode them so that mutations are propagated up
+    """
+    cached = namespace['OBJECT_ID'] is not None
+    lines = ['def encode_into(self, buf, field_id=None):']
+    if cached:
+        lines.append('    body = self._encoded')
+        lines.append('    if body is not None:')
+        lines.append('        if field_id is None:')
+        lines.append('            buf += body')
+        lines.append('        else:')
+        lines.append('            write_message(buf, body, field_id)')
+        lines.append('        return')
+    lines.append('    if field_id is not None:')
+    lines.append('        offset = begin_message(buf, field_id)')
+    if cached:
+        lines.append('    start = len(buf)')
+        lines.append('    buf += OBJECT_ID')
+    for i, field in enumerate(fields):
+        if field.nested:
+            lines.append('    value = self[%r]' % field.name)
+            lines.append('    if value is not None:')
+            lines.append('        value._adopt(self)')
+            lines.append('        value.encode_into(buf, %d)' % field.number)
+        else:
+            namespace['encode_%d' % i] = field.klass.encode_into
+            lines.append('    encode_%d(self[%r], buf, %d)' % (i, field.name, field.number))
+    if cached:
+        lines.append('    self._encoded = bytes(buf[start:])')
+    lines.append('    if field_id is not None:')
+    lines.append('        end_message(buf, offset)')
+    return lines
+
+
+def compile_sizer(klass, fields, namespace):
+    body = ['size = %d' % (0 if namespace['OBJECT_ID'] is None else len(namespace['OBJECT_ID']))]
+    for i, field in enumerate(fields):
+        if field.nested:
+            body.append('value = self[%r]' % field.name)
+            body.append('if value is not None:')
+            body.append('    size += value.encoded_size(%d)' % field.number)
+        else:
+            namespace['size_%d' % i] = field.klass.encoded_size
+            body.append('size += size_%d(self[%r], %d)' % (i, field.name, field.number))
+    lines = ['def encoded_size(self, field_id=None):']
+    if namespace['OBJECT_ID'] is None:
+        lines += ['    ' + line for line in body]
+    else:
+        lines.append('    body = self._encoded')
+        lines.append('    if body is not None:')
+        lines.append('        size = len(body)')
+        lines.append('    else:')
+        lines += ['        ' + line for line in body]
+    lines.append('    if field_id is None:')
+    lines.append('        return size')
+    lines.append('    return varint_size(field_id << 3 | 2) + varint_size(size) + size')
+    return lines
+
+
+def compile_json_writer(klass, fields, namespace):
+    """
+    write_json appends canonical JSON to a list of parts, from key fragments sorted in advance
+    Registered messages keep their JSON in _json until they are mutated, like _encoded
+    A message holding other keys than its fields is written like any other mapping
+    """
+    cached = namespace['OBJECT_ID'] is not None
+    namespace['NAMES'] = frozenset(field.name for field in fields)
+    lines = ['def write_json(self, parts):']
+    if cached:
+        lines.append('    text = self._json')
+        lines.append('    if text is not None:')
+        lines.append('        parts.append(text)')
+        lines.append('        return')
+    lines.append('    if self.keys() != NAMES:')
+    lines.append('        write_mapping(self, parts, self)')
+    lines.append('        return')
+    if cached:
+        lines.append('    start = len(parts)')
+    separator = '{'
+    for field in sorted(fields, key=lambda field: field.name):
+        lines.append('    parts.append(%r)' % (separator + encode_basestring_ascii(field.name) + ':'))
+        separator = ','
+        lines.append('    value = self[%r]' % field.name)
+        if issubclass(field.klass, str):
+            lines.append('    if isinstance(value, str):')
+            lines.append('        parts.append(encode_string(value))')
+            lines.append('    else:')
+            lines.append('        write_value(value, parts, self)')
+        else:
+            lines.append('    write_value(value, parts, self)')
+    lines.append('    parts.append(%r)' % ('}' if fields else '{}'))
+    if cached:
+        lines.append("    text = self._json = ''.join(parts[start:])")
+        lines.append('    del parts[start:]')
+        lines.append('    parts.append(text)')
+    return lines
+
+
+def compile_decoder(klass, fields, namespace, compact=False):
+    """
+    read_body builds klass itself, while the compact read_record_body builds klass.Record from raw values
+    """
+    if compact:
+        lines = ['def read_record_body(klass, data, pos, end, hrp=\'bnb\'):']
+    else:
+        lines = ['def read_body(klass, data, pos, end, hrp=\'bnb\'):']
+    if namespace['OBJECT_ID'] is not None:
+        lines.append('    pos = read_object_id(data, pos, end, OBJECT_ID)')
+    for i, field in enumerate(fields):
+        if not compact:
+            reader, default = field.klass.read, field.klass.default()
+        elif field.nested:
+            reader, default = field.klass.read_record, None
+        else:
+            reader, default = field.klass.read_raw, field.klass.raw_default
+        read, value = ('read_raw_%d' if compact else 'read_%d') % i, 'value_%d' % i
+        namespace[read] = reader
+        if field.repeated:
+            lines.append('    %s = []' % value)
+            lines.append('    while pos < end and data[pos] == %d:' % field.prefix)
+            lines.append('        item, pos = %s(data, pos + 1, end, hrp)' % read)
+            lines.append('        %s.append(item)' % value)
+            lines.append('    %s = %s(%s)' % (value, 'tuple' if compact else 'Repeated', value))
+        else:
+            namespace['default_' + read] = default
+            lines.append('    if pos < end and data[pos] == %d:' % field.prefix)
+            lines.append('        %s, pos = %s(data, pos + 1, end, hrp)' % (value, read))
+            lines.append('    else:')
+            lines.append('        %s = default_%s' % (value, read))
+    lines.append('    if pos != end:')
+    lines.append('        check_end(pos, end)')
+    if compact:
+        lines.append('    record = new_record(RECORD)')
+        lines.append('    record.hrp = hrp')
+        for i, field in enumerate(fields):
+            lines.append('    record.%s = value_%d' % (slot_name(field.name), i))
+        lines.append('    return record')
+    else:
+        lines.append('    obj = new(klass)')
+        values = ', '.join('%r: value_%d' % (field.name, i) for i, field in enumerate(fields))
+        lines.append('    init(obj, {%s})' % values)
+        lines.append('    return obj')
+    return lines
+
+
+def compile_record(klass, fields, repeated):
+    return type(klass.__name__ + 'Record', (Record,), {
+        '__slots__': tuple(slot_name(field.name) for field in fields),
+        'amino': klass,
+        'fields': fields,
+        'index': {field.name: field for field in fields},
+        'repeated': repeated,
+    })
+
+
+def compile_schema(klass, repeated):
+    """
+    Install encode_into, encoded_size, read_body, read_record_body, write_json and Record on klass from klass.fields
+    Methods written by hand in the class body take precedence
+    repeated is the list type for decoded repeated fields
+    """
+    fields = tuple(klass.fields)
+    klass.Record = compile_record(klass, fields, repeated)
+    namespace = {
+        'OBJECT_ID': klass.object_id() if hasattr(klass, 'object_id') else None,
+        'Repeated': repeated,
+        'begin_message': begin_message,
+        'end_message': end_message,
+        'read_object_id': read_object_id,
+        'check_end': check_end,
+        'varint_size': varint_size,
+        'write_message': write_message,
+        'encode_string': encode_basestring_ascii,
+        'write_mapping': write_mapping,
+        'write_value': write_value,
+        'new': dict.__new__,
+        'init': dict.__init__,
+        'new_record': object.__new__,
+        'RECORD': klass.Record,
+    }
+    source = compile_encoder(klass, fields, namespace)
+    source += [''] + compile_sizer(klass, fields, namespace)
+    source += [''] + compile_decoder(klass, fields, namespace)
+    source += [''] + compile_decoder(klass, fields, namespace, compact=True)
+    source += [''] + compile_json_writer(klass, fields, namespace)
+    exec(compile('\n'.join(source) + '\n', '<schema %s>' % klass.__name__, 'exec'), namespace)
+    if 'encode_into' not in klass.__dict__:
+        klass.encode_into = namespace['encode_into']
+    if 'encoded_size' not in klass.__dict__:
+        klass.encoded_size = namespace['encoded_size']
+    if 'read_body' not in klass.__dict__:
+        klass.read_body = classmethod(namespace['read_body'])
+    if 'read_record_body' not in klass.__dict__:
+        klass.read_record_body = classmethod(namespace['read_record_body'])
+    if 'write_json' not in klass.__dict__:
+        klass.write_json = namespace['write_json']
@@ -1,4 +1,10 @@
-from binance_transaction.base import Amino, Bytes, StringVarInt, VarInt, make_prefix
+from binance_transaction.base import Amino, Bytes, StringVarInt
+from binance_transaction.crypto import public_key_address
+from binance_transaction.schema import Field
+from binance_transaction.varint import varint_size
+from binance_transaction.wire import begin_message, check_end, end_message, read_object_id
+
+import base64
 
 
 """
@@ -20,28 +26,44 @@ class PubKeySecp256k1(Amino):
         # tendermint/PubKeySecp256k1
         return bytes.fromhex('EB5AE987')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['pub_key'].encode()
+    def encode_into(self, buf, field_id=None):
+        if field_id is not None:
+            offset = begin_message(buf, field_id)
+        buf += self.object_id()
+        self['pub_key'].encode_into(buf)
+        if field_id is not None:
+            end_message(buf, offset)
+
+    def encoded_size(self, field_id=None):
+        size = len(self.object_id()) + self['pub_key'].encoded_size()
         if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
+            return size
+        return varint_size(field_id << 3 | 2) + varint_size(size) + size
 
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return VarInt(0), data
-            data = data[len(prefix):]
-        assert data[0:4] == PubKeySecp256k1.object_id()
-        data = data[4:]
-        pub_key, data = Bytes.decode(data)
-        return PubKeySecp256k1(pub_key), data
+    @classmethod
+    def read_body(klass, data, pos, end, hrp='bnb'):
+        pos = read_object_id(data, pos, end, klass.object_id())
+        pub_key, pos = Bytes.read(data, pos, end)
+        check_end(pos, end)
+        return klass(pub_key)
+
+    @classmethod
+    def read_record_body(klass, data, pos, end, hrp='bnb'):
+        # a single small value, already compact
+        return klass.read_body(data, pos, end, hrp)
+
+    def to_amino(self):
+        return self
 
 
 class BnbSignature(Amino):
+    fields = (
+        Field(1, 'pub_key', PubKeySecp256k1),
+        Field(2, 'signature', Bytes),
+        Field(3, 'account_number', StringVarInt),
+        Field(4, 'sequence', StringVarInt),
+    )
+
     def __init__(self, pub_key, signature, account_number, sequence):
         dict.__init__(
             self,
@@ -51,23 +73,11 @@ class BnbSignature(Amino):
             sequence=StringVarInt(sequence)
         )
 
-    def encode(self, field_id):
-        buf = self['pub_key'].encode(1)
-        buf += self['signature'].encode(2)
-        buf += self['account_number'].encode(3)
-        buf += self['sequence'].encode(4)
-        return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
+    def public_key(self):
+        return base64.b64decode(str(self['pub_key']['pub_key']))
 
-    @staticmethod
-    def decode(data, field_id):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return VarInt(0), data
-            data = data[len(prefix):]
-        pub_key, data = PubKeySecp256k1.decode(data, 1)
-        signature, data = Bytes.decode(data, 2)
-        account_number, data = VarInt.decode(data, 3)
-        sequence, data = VarInt.decode(data, 4)
-        return BnbSignature(pub_key, signature, account_number, sequence), data
+    def signer(self, hrp='bnb'):
+        """
+        Address of the account that made this signature
+        """
+        return public_key_address(self.public_key(), hrp)
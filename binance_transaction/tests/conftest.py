@@ -0,0 +1,90 @@
+import pytest
+
+from binance_transaction.base import Input, Output, Repeated, StringToken, String, Token
+from binance_transaction.bnb_transaction import BnbTransaction, sign_many
+from binance_transaction.dex import DexList, NewOrder, CancelOrder, BUY, GTE, LIMIT_ORDER
+from binance_transaction.gov import Proposal, Vote
+from binance_transaction.token import Send, Issue, Mint, Burn, Freeze, Unfreeze, TimeLock, TimeUnlock, TimeRelock
+
+
+"""
+conftest.py
+
+Fixtures shared by the tests
+Messages are built fresh for each test, as tests mutate them and their encode caches
+
+* address
+* sample_msgs
+* signed_tx
+* signed_orders
+"""
+
+
+ADDRESS = 'bnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcn292qwu'
+
+
+def make_sample_msgs():
+    return [
+        Send(
+            Repeated([Input(ADDRESS, Repeated([Token(5, 'BNB'), Token(7, 'TUSDB-888')]))]),
+            Repeated([Output(ADDRESS, Repeated([Token(5, 'BNB')])), Output(ADDRESS, Repeated([Token(7, 'TUSDB-888')]))])
+        ),
+        Issue(ADDRESS, 'TrueUSD', 'TUSDB', 8999999999999999999, True),
+        Mint(ADDRESS, 'TUSDB-888', 100),
+        Burn(ADDRESS, 'TUSDB-888', 100),
+        Freeze(ADDRESS, 'TUSDB-888', 100),
+        Unfreeze(ADDRESS, 'TUSDB-888', 100),
+        TimeLock(String(ADDRESS), 'lock', Repeated([Token(100, 'BNB')]), 1568000000),
+        TimeUnlock(ADDRESS, 3),
+        TimeRelock(ADDRESS, 3, 'relock', Repeated([Token(100, 'BNB')]), 1568000000),
+        DexList(ADDRESS, 63, 'BTCB-1DE', 'USDSB-1AC', 1140000000000),
+        NewOrder(ADDRESS, 'BC44784B0C99AA301DAC66C8A477354E039FDB13-9', 'TUSDB-888_BNB', LIMIT_ORDER, BUY, 3500000,
+                 500000000, GTE),
+        CancelOrder(ADDRESS, 'TUSDB-888_BNB', 'BC44784B0C99AA301DAC66C8A477354E039FDB13-9'),
+        Proposal('title', 'description', 'ListTradingPair', ADDRESS, Repeated([StringToken(1000, 'BNB')]), 14400),
+        Vote(12, ADDRESS, 'NoWithVeto'),
+    ]
+
+
+@pytest.fixture
+def address():
+    return ADDRESS
+
+
+@pytest.fixture
+def sample_msgs():
+    """
+    One message of every type
+    """
+    return make_sample_msgs()
+
+
+@pytest.fixture
+def signed_tx():
+    """
+    Builds a transaction of every sample message, with a placeholder signature
+    """
+    def build(klass=BnbTransaction):
+        tx = klass(30935, 23330, 1)
+        for msg in make_sample_msgs():
+            tx.add_msg(msg)
+        tx['memo'] = '105434132'
+        public_key = bytes.fromhex('0217067b36f33c1178d09dfb7b8b59853edc871a7044f2f7ddad885ddfb353152d')
+        tx.apply_sig(bytes(range(64)), public_key)
+        return tx
+    return build
+
+
+@pytest.fixture
+def signed_orders():
+    """
+    Builds count one-order transactions with consecutive sequences, signed with secret
+    """
+    def build(count, secret=987654321):
+        txs = []
+        for sequence in range(count):
+            tx = BnbTransaction(1, sequence)
+            tx.add_msg(NewOrder(ADDRESS, 'order-%d' % sequence, 'BNB_BTCB-1DE', LIMIT_ORDER, BUY, 1, 100000000, GTE))
+            txs.append(tx)
+        return sign_many(txs, secret)
+    return build
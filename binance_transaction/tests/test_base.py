@@ -1,7 +1,10 @@
-from binance_transaction.base import Bool, Bytes, String, StringVarInt, VarInt
+from binance_transaction.base import Bool, Bytes, String, StringVarInt, VarInt, make_prefix
+from binance_transaction.exceptions import AminoDecodeError
+from binance_transaction.wire import begin_message, end_message
 
 
 import base64
+import pytest
 
 
 def test_decode_varint():
@@ -43,3 +46,35 @@ def test_decode_bytes():
         decoded, remaining = Bytes.decode(encoded)
         assert decoded == b64val
         assert remaining == b''
+
+
+def test_message_length_backpatch():
+    for length in [1, 127, 128, 300, 16383, 16384]:
+        buf = bytearray(b'\xff')
+        offset = begin_message(buf, 1)
+        buf += b'\x01' * length
+        end_message(buf, offset)
+        assert bytes(buf) == b'\xff' + make_prefix(1, 2) + VarInt(length).encode() + b'\x01' * length
+
+
+def test_decode_out_of_bounds():
+    with pytest.raises(AminoDecodeError):
+        VarInt.decode(b'\x80\x80')
+    with pytest.raises(AminoDecodeError):
+        VarInt.decode(b'\xff' * 11)
+    with pytest.raises(AminoDecodeError):
+        String.decode(b'\x05abc')
+    with pytest.raises(AminoDecodeError):
+        String.decode(b'\x0a\x05abc', 1)
+
+
+def test_encoded_size():
+    values = [
+        VarInt(0), VarInt(1), VarInt(127), VarInt(128), VarInt(2 ** 63 - 1), Bool(True), Bool(False),
+        StringVarInt(300), String(''), String('BNB'), String('ünïcode'), String('x' * 200),
+        Bytes(''), Bytes(base64.b64encode(b'a').decode()), Bytes(base64.b64encode(b'ab').decode()),
+        Bytes(base64.b64encode(b'abc' * 50).decode()),
+    ]
+    for value in values:
+        assert value.encoded_size() == len(value.encode())
+        assert value.encoded_size(5) == len(value.encode(5))
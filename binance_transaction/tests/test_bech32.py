@@ -0,0 +1,92 @@
+import pytest
+
+from binance_transaction import bech32
+from binance_transaction.bech32 import (
+    INVALID_CHARACTER, INVALID_CHECKSUM, INVALID_LENGTH, INVALID_SEPARATOR, MIXED_CASE, WRONG_HRP, AddressCheck,
+    address_bytes, address_cache_clear, address_cache_info, address_str, bech32_encode, bech32_polymod,
+    validate_addresses
+)
+
+
+ADDRESS = 'bnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcn292qwu'
+RAW = bytes.fromhex('BC44784B0C99AA301DAC66C8A477354E039FDB13')
+
+
+def test_address_cache():
+    address_cache_clear()
+    assert address_bytes(ADDRESS) == RAW
+    assert address_bytes(ADDRESS) == RAW
+    assert address_str('bnb', RAW) == ADDRESS
+    assert address_str('tbnb', RAW) == 'tbnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcnysrywd'
+    info = address_cache_info()
+    assert (info['address_bytes'].hits, info['address_bytes'].misses) == (1, 1)
+    assert (info['address_str'].hits, info['address_str'].misses) == (0, 2)
+
+
+def reference_polymod(values):
+    generator = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            chk ^= generator[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def test_polymod():
+    values = [(i * 7) % 32 for i in range(100)]
+    for length in range(len(values)):
+        assert bech32_polymod(values[:length]) == reference_polymod(values[:length])
+
+
+def test_validate_addresses(capsys):
+    checks = validate_addresses([
+        ADDRESS,
+        ADDRESS.upper(),
+        'tbnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcnysrywd',
+        ADDRESS[:-1] + 'v',
+        ADDRESS[:5] + 'B' + ADDRESS[6:],
+        ADDRESS[:5] + 'b' + ADDRESS[6:],
+        'bnb' + ADDRESS[4:],
+        'bnb1ë',
+        bech32_encode('bnb', RAW[:19]),
+    ], hrp='bnb')
+    assert checks[0] == AddressCheck(ADDRESS, True, 'bnb', RAW, None)
+    assert checks[1].valid
+    assert [check.error for check in checks[2:]] == [
+        WRONG_HRP, INVALID_CHECKSUM, MIXED_CASE, INVALID_CHARACTER, INVALID_SEPARATOR, INVALID_CHARACTER, INVALID_LENGTH
+    ]
+    assert capsys.readouterr().out == ''
+    with pytest.raises(ValueError):
+        address_bytes(ADDRESS[:-1] + 'v')
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+def test_bech32_encode_many(monkeypatch, vectorized):
+    if vectorized:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(bech32, 'numpy', None)
+    hashes = [bytes((i * 37 + j) % 256 for j in range(20)) for i in range(50)] + [RAW]
+    for hrp in ['bnb', 'tbnb']:
+        encoded = bech32.bech32_encode_many(b''.join(hashes), hrp)
+        assert encoded == [bech32_encode(hrp, raw) for raw in hashes]
+    assert encoded[-1] == 'tbnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcnysrywd'
+    assert bech32.bech32_encode_many(b'', 'bnb') == []
+    with pytest.raises(ValueError):
+        bech32.bech32_encode_many(b''.join(hashes)[:-1])
+    with pytest.raises(ValueError):
+        bech32.bech32_encode_many(RAW[:19])
+
+
+def test_bech32_encode_many_arrays():
+    numpy = pytest.importorskip('numpy')
+    rows = numpy.frombuffer(RAW * 8, dtype=numpy.uint8)
+    assert bech32.bech32_encode_many(rows.reshape(8, 20)) == [ADDRESS] * 8
+    assert bech32.bech32_encode_many(rows) == [ADDRESS] * 8
+    assert bech32.bech32_encode_many(rows.reshape(8, 20).astype(numpy.int64)) == [ADDRESS] * 8
+    wide = rows.astype(numpy.int64)
+    for bad in [rows.reshape(5, 32), rows.reshape(2, 4, 20), rows.astype(numpy.float64), wide + 256, wide - 256]:
+        with pytest.raises(ValueError):
+            bech32.bech32_encode_many(bad)
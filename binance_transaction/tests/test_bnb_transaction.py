@@ -0,0 +1,48 @@
+from binance_transaction.bnb_transaction import BnbTransaction, TestBnbTransaction
+from binance_transaction.dex import NewOrder
+
+
+def test_encode_cache(signed_tx, address):
+    tx = signed_tx()
+    encoded = tx.encode()
+    order = tx['msgs'][10]
+    cached = order._encoded
+    tx['memo'] = 'changed'
+    assert tx._encoded is None
+    assert order._encoded is cached
+    assert tx.encode() != encoded
+    tx['memo'] = '105434132'
+    assert tx.encode() == encoded
+    order['price'] = 3600000
+    assert tx._encoded is None
+    assert BnbTransaction.decode(tx.encode())[0]['msgs'][10]['price'] == 3600000
+    tx.remove_sig()
+    tx.add_msg(NewOrder(address, 'id', 'BNB_BTCB-1DE', 2, 1, 1, 1, 1))
+    assert tx.encoded_size() == len(tx.encode())
+    assert BnbTransaction.decode(tx.encode())[0]['msgs'] == tx['msgs']
+
+
+def test_lazy_transaction(signed_tx):
+    for klass in [BnbTransaction, TestBnbTransaction]:
+        encoded = signed_tx(klass).encode()
+        tx, remaining = klass.decode(encoded)
+        lazy = klass.decode_lazy(encoded + b'\x00')
+        assert lazy.hash() == tx.hash()
+        assert lazy.encode() == encoded
+        assert lazy.msg_types()[9:12] == ['dex/ListMsg', 'dex/NewOrder', 'dex/CancelOrder']
+        assert lazy.msgs == [None] * 14
+        assert lazy.find('dex/NewOrder') == [(10, tx['msgs'][10])]
+        assert lazy.msgs[10] is not None and lazy.msgs[9] is None
+        assert lazy['sequence'] == '23330'
+        assert lazy == tx
+        assert lazy.to_amino() == tx
+        assert lazy.signing_json() == tx.signing_json()
+
+
+def test_signers(signed_tx, address):
+    tx = signed_tx()
+    assert tx.signers() == BnbTransaction.decode_lazy(tx.encode()).signers() == [address]
+    testnet = signed_tx(TestBnbTransaction)
+    assert testnet.signers() == TestBnbTransaction.decode_lazy(testnet.encode()).signers() == [
+        'tbnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcnysrywd'
+    ]
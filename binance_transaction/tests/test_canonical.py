@@ -0,0 +1,39 @@
+import json
+
+from binance_transaction.base import Bool, Repeated, Token
+from binance_transaction.bnb_transaction import BnbTransaction
+from binance_transaction.canonical import canonical_json, dumps
+
+
+def reference_signing_json(tx):
+    return json.dumps({
+        name: tx[name] for name in ('account_number', 'chain_id', 'data', 'memo', 'msgs', 'sequence', 'source')
+    }, sort_keys=True, separators=(',', ':')).encode('utf8')
+
+
+def test_canonical_json(sample_msgs):
+    values = [
+        None, True, False, 0, -5, Bool(True), 1.5, 'café ☃ "quoted"\n', [], {}, (1, 'two'),
+        {'b': [1, {'d': None, 'c': 2}], 'a': ''}, {1: 'one', 2: 'two'}, sample_msgs, Repeated([Token(1, 'BNB')]),
+    ]
+    for value in values:
+        assert canonical_json(value) == dumps(value).encode('utf8')
+
+
+def test_signing_json(signed_tx):
+    tx = signed_tx()
+    assert tx.signing_json() == reference_signing_json(tx)
+    decoded = BnbTransaction.decode(tx.encode())[0]
+    assert decoded.signing_json() == reference_signing_json(decoded)
+    send = tx['msgs'][0]
+    cached = send._json
+    assert cached is not None
+    tx['sequence'] = '23331'
+    assert send._json is cached
+    send['inputs'][0]['coins'][0]['amount'] = 99
+    assert send._json is None
+    assert tx.signing_json() == reference_signing_json(tx)
+    assert b'"amount":99' in tx.signing_json()
+    tx['msgs'][1]['note'] = 'not a field'
+    tx['memo'] = 'é'
+    assert tx.signing_json() == reference_signing_json(tx)
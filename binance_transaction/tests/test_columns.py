@@ -0,0 +1,68 @@
+import copy
+import pytest
+
+from binance_transaction.base import Address, Input, Token, VarInt
+from binance_transaction.columns import new_orders, send_column, to_fixed, varint_column
+from binance_transaction.dex import BUY, NewOrder
+from binance_transaction.token import Send
+from binance_transaction.varint import varint_bytes
+
+numpy = pytest.importorskip('numpy')
+
+
+def test_to_fixed():
+    assert to_fixed(numpy.array([0.035, 5, 1e-8, 12.5])).tolist() == [3500000, 500000000, 1, 1250000000]
+    assert to_fixed(numpy.array([1, 92233720368])).tolist() == [100000000, 9223372036800000000]
+    with pytest.raises(ValueError):
+        to_fixed(numpy.array([1.000000001]))
+    with pytest.raises(ValueError):
+        to_fixed(numpy.array([5000000.000000253]))
+    fixed = numpy.random.RandomState(8).randint(1, 10 ** 15, 10000, dtype=numpy.int64)
+    assert (to_fixed(fixed / 1e8) == fixed).all()
+    with pytest.raises(ValueError):
+        to_fixed(numpy.array([1.0, numpy.nan]))
+    with pytest.raises(ValueError):
+        to_fixed(numpy.array([92233720369]))
+    with pytest.raises(ValueError):
+        to_fixed(numpy.array([0.0]))
+    with pytest.raises(ValueError):
+        to_fixed(numpy.array([1.5, 0.25]), lot_size=50000000)
+
+
+def test_varint_column():
+    values = [1, 127, 128, 16384, 3500000, 500000000, 2 ** 63 - 1]
+    assert varint_column(numpy.array(values, dtype=numpy.int64)) == [varint_bytes(value) for value in values]
+
+
+def test_new_orders(address):
+    orders = new_orders(address, 'TUSDB-888_BNB', BUY, ['a-1', 'a-2'], numpy.array([0.035, 0.036]),
+                        numpy.array([5.0, 6.0]), lot_size=100000000)
+    assert orders[1]['price'] == 3600000
+    assert orders[1]['quantity'] == 600000000
+    for order in orders:
+        assert order.encode(1) == copy.deepcopy(order).encode(1)
+        assert NewOrder.decode(order.encode()) == (order, b'')
+
+
+def test_send_column(address):
+    recipients = [address, 'bnb136ns6lfw4zs5hg4n85vdthaad7hq5m4gtkgf23'] * 50
+    send = send_column(address, 'BNB', recipients, numpy.arange(1, 101) / 100)
+    assert send['inputs'][0]['coins'][0]['amount'] == 5050000000
+    assert send['outputs'][99]['coins'][0]['amount'] == 100000000
+    assert send.encode(1) == copy.deepcopy(send).encode(1)
+    assert Send.decode(send.encode()) == (send, b'')
+
+
+def test_send_column_mutation(address):
+    mutations = [
+        lambda send: send['outputs'][1]['coins'][0].__setitem__('amount', VarInt(7)),
+        lambda send: send['outputs'][1]['coins'].append(Token(3, 'BNB')),
+        lambda send: send['outputs'][1].__setitem__('address', Address(address)),
+        lambda send: send['outputs'].pop(),
+        lambda send: send['inputs'][0]['coins'][0].__setitem__('amount', VarInt(7)),
+        lambda send: send['inputs'].append(Input(address, [Token(3, 'BNB')])),
+    ]
+    for mutate in mutations:
+        send = send_column(address, 'BNB', [address, 'bnb136ns6lfw4zs5hg4n85vdthaad7hq5m4gtkgf23'], [0.5, 1.5])
+        mutate(send)
+        assert send._encoded is None
@@ -0,0 +1,28 @@
+from binance_transaction.bnb_transaction import BnbTransaction, TestBnbTransaction
+from binance_transaction.dex import NewOrder
+
+
+def test_compact_matches_decode(signed_tx):
+    for klass in [BnbTransaction, TestBnbTransaction]:
+        encoded = signed_tx(klass).encode()
+        decoded, remaining = klass.decode(encoded)
+        record = klass.decode_compact(encoded)
+        assert record == decoded
+        assert record.to_amino() == decoded
+        assert record.signing_json() == decoded.signing_json()
+        assert record.encode() == encoded
+        assert decoded.encoded_size() == len(encoded)
+
+
+def test_compact_fields(signed_tx, address):
+    record = BnbTransaction.decode_compact(signed_tx().encode())
+    assert record['account_number'] == '30935'
+    assert record['sequence'] == '23330'
+    assert record['memo'] == '105434132'
+    order = record['msgs'][10]
+    assert order.amino is NewOrder
+    assert order.sender == bytes.fromhex('BC44784B0C99AA301DAC66C8A477354E039FDB13')
+    assert order['sender'] == address
+    assert order['price'] == 3500000
+    assert not hasattr(order, '__dict__')
+    assert record['msgs'][0]['inputs'][0]['coins'][1] == {'denom': 'TUSDB-888', 'amount': 7}
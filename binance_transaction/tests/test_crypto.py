@@ -0,0 +1,67 @@
+import hashlib
+
+import pytest
+from ecdsa import SigningKey, VerifyingKey
+from ecdsa.curves import SECP256k1
+from ecdsa.keys import BadSignatureError
+
+from binance_transaction import crypto
+from binance_transaction.benchmark import benchmark, check_parity
+from binance_transaction.crypto import (
+    PRECOMPUTE_AFTER, backends, cache_hit_rate, coincurve, compress_key, get_backend, precompute, private_key,
+    uncompress_key, use_backend, verify_sig, verifying_key
+)
+
+
+def test_uncompress_key():
+    compressed = bytes.fromhex('0217067B36F33C1178D09DFB7B8B59853EDC871A7044F2F7DDAD885DDFB353152D')
+    assert compress_key(uncompress_key(compressed)) == compressed
+
+
+def test_verifying_key_cache():
+    signing_key = SigningKey.from_secret_exponent(123456789, curve=SECP256k1)
+    public_key = b'\x04' + signing_key.get_verifying_key().to_string()
+    compressed = compress_key(public_key)
+    digest = hashlib.sha256(b'message').digest()
+    signature = signing_key.sign_digest_deterministic(digest, hashfunc=hashlib.sha256)
+    verifying_key.cache_clear()
+    for _ in range(PRECOMPUTE_AFTER + 1):
+        assert verify_sig(compressed, digest, signature)
+        assert not verify_sig(compressed, hashlib.sha256(b'other').digest(), signature)
+    assert verify_sig(public_key, digest, signature)
+    info = verifying_key.cache_info()
+    assert (info.hits, info.misses) == (2 * PRECOMPUTE_AFTER + 1, 2)
+    assert cache_hit_rate(info) == info.hits / (info.hits + info.misses)
+    assert verifying_key(compressed).uses == 2 * PRECOMPUTE_AFTER + 2
+
+
+def test_precompute():
+    signing_key = SigningKey.from_secret_exponent(123456789, curve=SECP256k1)
+    digest = hashlib.sha256(b'message').digest()
+    signature = signing_key.sign_digest_deterministic(digest, hashfunc=hashlib.sha256)
+    key = precompute(VerifyingKey.from_string(signing_key.get_verifying_key().to_string(), curve=SECP256k1), SECP256k1)
+    assert key.to_string() == signing_key.get_verifying_key().to_string()
+    assert key.verify_digest(signature, digest)
+    with pytest.raises(BadSignatureError):
+        key.verify_digest(signature, hashlib.sha256(b'other').digest())
+
+
+@pytest.mark.parametrize('name', sorted(backends))
+def test_backend_parity(name):
+    assert check_parity([name], count=4) == []
+    timings = benchmark([name], count=2, keys=2)
+    assert sorted(timings[name]) == ['compress', 'decompress', 'sign_digest', 'verify_digest']
+
+
+def test_backend_selection(monkeypatch):
+    assert get_backend('auto').name == ('coincurve' if coincurve else 'python')
+    with pytest.raises(ValueError):
+        get_backend('openssl')
+    with pytest.raises(ValueError):
+        use_backend('openssl')
+    monkeypatch.setattr(crypto, 'selected_backend', crypto.selected_backend)
+    use_backend('python')
+    assert get_backend() is backends['python']
+    assert private_key(123456789).backend is backends['python']
+    assert private_key(private_key(123456789), 'ecdsa').backend is backends['ecdsa']
+    assert private_key(123456789) is not private_key(123456789)
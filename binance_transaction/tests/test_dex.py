@@ -47,6 +47,7 @@ def test_new_order():
     print(valid_tx.hex())
     print(tx.encode().hex())
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -88,6 +89,7 @@ def test_cancel_order():
     print(valid_tx.hex())
     print(tx.encode().hex())
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
 
@@ -124,6 +126,7 @@ def test_listdex():
     valid_public_key = base64.b64decode('A/s9EujCgji72Oltokq4ll9PWvKgVN7YQTVuOeiPZG1h')
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -0,0 +1,68 @@
+import hashlib
+
+import pytest
+
+from binance_transaction import ecc
+from binance_transaction.crypto import private_key, verify_sig
+
+
+def test_multiply_generator():
+    assert ecc.multiply_generator(1) == ecc.G
+    assert ecc.multiply_generator(ecc.N) is None
+    assert ecc.multiply_generator(ecc.N - 1) == (ecc.G[0], ecc.P - ecc.G[1])
+    x, y = ecc.multiply_generator(2 ** 255 + 12345)
+    assert (y * y - x ** 3 - 7) % ecc.P == 0
+
+
+def test_batch_inverse():
+    values = [1, 2, 3, ecc.N - 1, 2 ** 200]
+    assert [value * inverse % ecc.N for value, inverse in zip(values, ecc.batch_inverse(values, ecc.N))] == [1] * 5
+
+
+@pytest.mark.parametrize('secret', [1, 2, 123456789, ecc.N - 1, 0x1F2E3D4C5B6A7988 ** 3 % ecc.N])
+def test_sign_matches_ecdsa(secret):
+    reference = private_key(secret, 'ecdsa')
+    key = private_key(secret, 'python')
+    assert key.public_key == reference.public_key
+    for message in range(20):
+        digest = hashlib.sha256(b'%d' % message).digest()
+        signature = key.sign_digest(digest)
+        assert signature == reference.sign_digest(digest)
+        assert verify_sig(key.public_key, digest, signature)
+
+
+def test_private_key_backend():
+    key = private_key(987654321, 'python')
+    assert private_key(key) is key
+    assert private_key(key, 'ecdsa').public_key == key.public_key
+    with pytest.raises(ValueError):
+        private_key(987654321, 'openssl')
+
+
+def test_split_scalar():
+    for k in (1, ecc.N - 1, 2 ** 255, 0x1F2E3D4C5B6A7988 ** 4 % ecc.N):
+        k1, k2 = ecc.split_scalar(k)
+        assert (k1 + k2 * ecc.LAMBDA - k) % ecc.N == 0
+        assert abs(k1) < 2 ** 128 and abs(k2) < 2 ** 128
+    assert ecc.endomorphism([ecc.G]) == [ecc.multiply_generator(ecc.LAMBDA)]
+
+
+def test_verify_digest():
+    ecc.key_multiples.cache_clear()
+    key = private_key(123456789, 'python')
+    uncompressed = b'\x04' + b''.join(coordinate.to_bytes(32, 'big') for coordinate in ecc.decode_point(key.public_key))
+    for message in range(10):
+        digest = hashlib.sha256(b'%d' % message).digest()
+        signature = key.sign_digest(digest)
+        for public_key in (key.public_key, uncompressed):
+            assert verify_sig(public_key, digest, signature, backend='python')
+            assert not verify_sig(public_key, hashlib.sha256(digest).digest(), signature, backend='python')
+        s = int.from_bytes(signature[32:], 'big')
+        high_s = signature[:32] + (ecc.N - s).to_bytes(32, 'big')
+        assert verify_sig(key.public_key, digest, high_s, backend='python')
+        assert not ecc.verify_digest(key.public_key, digest, signature[:32] + bytes(32))
+        assert not ecc.verify_digest(key.public_key, digest, signature[:63])
+    info = ecc.key_multiples.cache_info()
+    assert (info.hits, info.misses) == (48, 2)
+    with pytest.raises(ValueError):
+        ecc.verify_digest(b'\x02' + bytes(32), digest, signature)
@@ -0,0 +1,26 @@
+import pytest
+
+from binance_transaction.base import Bytes, Repeated
+from binance_transaction.bnb_transaction import BnbTransaction, TestBnbTransaction
+from binance_transaction.factory import AccountTxFactory
+from binance_transaction.verify import verify_transactions
+
+
+@pytest.mark.parametrize('transaction', [BnbTransaction, TestBnbTransaction])
+@pytest.mark.parametrize('account_number, memo, data', [(30935, '', None), (0, 'memo ☃', 'AAEC')])
+def test_factory_matches_sign(sample_msgs, transaction, account_number, memo, data):
+    factory = AccountTxFactory(987654321, account_number, '1', transaction, memo, data)
+    msgs = sample_msgs
+    for sequence in (0, 1, 300):
+        expected = transaction(account_number, sequence, '1')
+        expected['memo'] = memo
+        expected['data'] = None if data is None else Bytes(data)
+        expected['msgs'] = Repeated(msgs)
+        expected.sign(987654321)
+        encoded = factory.encode(sequence, msgs)
+        assert encoded == expected.encode() == factory.build(sequence, msgs).encode()
+        assert factory.signing_json(sequence, msgs) == expected.signing_json()
+        assert transaction.decode(encoded)[0].encode() == encoded
+        assert verify_transactions([expected], workers=1) == [True]
+    with pytest.raises(ValueError):
+        factory.encode(-1, [])
@@ -36,6 +36,7 @@ def test_vote_encoding():
     valid_public_key = base64.b64decode('AlK/+L/va2UNh+a+vJDg7jwIqssgj0g/xkbTIK0ZFJ5x')
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -84,6 +85,7 @@ def test_proposal_encoding():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     assert valid_tx_hash == tx.hash()
     tx.remove_sig()
     print(tx.signing_json())
@@ -133,6 +135,7 @@ def test_recent_proposal():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_pubkey))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     valid_signing_bytes = bytes.fromhex(
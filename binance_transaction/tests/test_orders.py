@@ -0,0 +1,77 @@
+import pytest
+
+from binance_transaction.bnb_transaction import BnbTransaction
+from binance_transaction.canonical import canonical_json
+from binance_transaction.dex import BUY, GTE, IOC, LIMIT_ORDER, SELL, CancelOrder, NewOrder
+from binance_transaction.factory import AccountTxFactory
+from binance_transaction.orders import OrderRegistry, OrderTemplate
+
+
+@pytest.mark.parametrize('side, price, quantity, timeinforce', [
+    (BUY, 3500000, 500000000, GTE),
+    (SELL, 0, 0, IOC),
+    (BUY, 2 ** 62, 1, GTE),
+])
+def test_order_template(address, side, price, quantity, timeinforce):
+    template = OrderTemplate(address, 'TUSDB-888_BNB', LIMIT_ORDER, timeinforce)
+    order = template.next_order(side, price, quantity, 8)
+    assert order['id'] == 'BC44784B0C99AA301DAC66C8A477354E039FDB13-9'
+    expected = NewOrder(address, order['id'], 'TUSDB-888_BNB', LIMIT_ORDER, side, price, quantity, timeinforce)
+    assert order == expected
+    assert order._encoded == expected.encode()
+    assert order._json.encode('utf8') == canonical_json(expected)
+    assert NewOrder.decode(order.encode()) == (expected, b'')
+    order['price'] = 1
+    assert order.encode() == NewOrder(address, order['id'], 'TUSDB-888_BNB', LIMIT_ORDER, side, 1, quantity,
+                                      timeinforce).encode()
+    with pytest.raises(ValueError):
+        template.order(BUY, -1, 1, 'id')
+
+
+def test_order_template_transaction(address):
+    template = OrderTemplate(address, 'TUSDB-888_BNB')
+    factory = AccountTxFactory(987654321, 30935)
+    order = template.next_order(BUY, 3500000, 500000000, 23330)
+    expected = BnbTransaction(30935, 23330)
+    expected.add_msg(NewOrder(address, order['id'], 'TUSDB-888_BNB', LIMIT_ORDER, BUY, 3500000, 500000000, GTE))
+    assert factory.encode(23330, [order]) == expected.sign(987654321).encode()
+
+
+def test_order_registry(address):
+    registry = OrderRegistry()
+    template = OrderTemplate(address, 'TUSDB-888_BNB', registry=registry)
+    orders = [template.next_order(BUY if sequence % 2 else SELL, 100 + sequence, 10, sequence) for sequence in range(6)]
+    other = registry.add(NewOrder(address, 'other', 'BNB_BTCB-1DE', LIMIT_ORDER, BUY, 1, 1, GTE))
+    assert len(registry) == 7 and orders[0]['id'] in registry
+    assert registry.orders('TUSDB-888_BNB', BUY) == orders[1::2]
+    assert registry.orders('TUSDB-888_BNB') == orders[0::2] + orders[1::2]
+    assert registry.orders(side=BUY) == orders[1::2] + [other]
+    cancel = registry.cancel(orders[3]['id'])
+    expected = CancelOrder(address, 'TUSDB-888_BNB', orders[3]['id'])
+    assert cancel == expected
+    assert cancel._encoded == expected.encode()
+    assert cancel._json.encode('utf8') == canonical_json(expected)
+    assert [message['refid'] for message in registry.cancel_all('TUSDB-888_BNB', SELL)] == [
+        order['id'] for order in orders[0::2]
+    ]
+    assert len(registry.cancel_all()) == 7
+    assert registry.remove(orders[3]['id']) is orders[3]
+    assert registry.remove(orders[3]['id']) is None
+    registry.remove('other')
+    assert registry.orders('BNB_BTCB-1DE') == [] and 'BNB_BTCB-1DE' not in registry.by_symbol
+    with pytest.raises(KeyError):
+        registry.cancel('other')
+
+
+def test_order_registry_mutated_order(address):
+    registry = OrderRegistry()
+    order = registry.add(NewOrder(address, 'id', 'BNB_BTCB-1DE', LIMIT_ORDER, BUY, 1, 1, GTE))
+    order['side'] = SELL
+    order['symbol'] = 'TUSDB-888_BNB'
+    assert registry.orders('BNB_BTCB-1DE', BUY) == registry.orders(side=BUY) == [order]
+    registry.add(order)
+    assert registry.orders('TUSDB-888_BNB', SELL) == registry.orders(side=SELL) == [order]
+    assert registry.by_symbol == {'TUSDB-888_BNB': {SELL: {'id': order}}}
+    order['side'] = BUY
+    assert registry.remove('id') is order
+    assert len(registry) == 0 and registry.by_symbol == {} and registry.index_keys == {}
@@ -0,0 +1,44 @@
+import pytest
+
+from binance_transaction.bnb_transaction import BnbTransaction
+from binance_transaction.dex import NewOrder
+from binance_transaction.exceptions import AminoDecodeError
+from binance_transaction.projection import PLAN_CACHE_SIZE, compile_plan, project
+from binance_transaction.varint import varint_bytes
+
+
+def test_project(signed_tx, address):
+    tx = signed_tx()
+    projected = project(tx.encode(), ['from', 'sender', 'symbol', 'amount'])
+    assert len(projected) == 14
+    assert projected[0] == {'type': 'cosmos-sdk/Send'}
+    assert projected[2] == {'type': 'tokens/MintMsg', 'from': address, 'symbol': 'TUSDB-888', 'amount': 100}
+    assert projected[6] == {'type': 'tokens/TimeLockMsg', 'from': address, 'amount': [{'denom': 'BNB', 'amount': 100}]}
+    assert projected[10] == {'type': 'dex/NewOrder', 'sender': address, 'symbol': 'TUSDB-888_BNB'}
+
+
+def test_project_nested(signed_tx):
+    tx = signed_tx()
+    sends = project(tx.encode(), ['inputs.coins.denom', 'outputs'], ['cosmos-sdk/Send'])
+    assert sends == [{
+        'type': 'cosmos-sdk/Send',
+        'inputs': [{'coins': [{'denom': 'BNB'}, {'denom': 'TUSDB-888'}]}],
+        'outputs': [dict(output) for output in tx['msgs'][0]['outputs']],
+    }]
+    gov_types = ['cosmos-sdk/MsgSubmitProposal', 'cosmos-sdk/MsgVote']
+    assert project(tx.encode(), ['proposal_type', 'option'], gov_types) == [
+        {'type': 'cosmos-sdk/MsgSubmitProposal', 'proposal_type': 'ListTradingPair'},
+        {'type': 'cosmos-sdk/MsgVote', 'option': 'NoWithVeto'},
+    ]
+
+
+def test_plan_cache_is_bounded():
+    for i in range(PLAN_CACHE_SIZE + 10):
+        compile_plan(NewOrder, ('symbol', 'field-%d' % i))
+    assert compile_plan.cache_info().currsize == PLAN_CACHE_SIZE
+
+
+def test_project_truncated_message():
+    body = BnbTransaction.object_id() + b'\x0a\x02' + NewOrder.object_id()[:2]
+    with pytest.raises(AminoDecodeError):
+        project(varint_bytes(len(body)) + body, ['symbol'])
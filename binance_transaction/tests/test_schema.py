@@ -0,0 +1,66 @@
+import copy
+import pickle
+import pytest
+
+from binance_transaction.base import Amino, Output, Repeated, Token, VarInt
+from binance_transaction.msg import Msg, msg_class_by_object_id
+from binance_transaction.schema import Field
+from binance_transaction.token import Send
+
+
+def test_every_msg_roundtrips(sample_msgs):
+    assert set(type(msg) for msg in sample_msgs) == set(msg_class_by_object_id.values())
+    for msg in sample_msgs:
+        assert type(msg).decode(msg.encode()) == (msg, b'')
+        decoded, remaining = Msg.decode(msg.encode(1), 1)
+        assert type(decoded) is type(msg)
+        assert decoded == msg
+        assert remaining == b''
+
+
+def test_field_numbers():
+    with pytest.raises(ValueError):
+        Field(16, 'wide', VarInt)
+
+
+def test_handwritten_methods_win():
+    class Custom(Amino):
+        fields = (
+            Field(1, 'amount', VarInt),
+        )
+
+        def encode_into(self, buf, field_id=None):
+            buf += b'custom'
+
+    custom = Custom(amount=VarInt(3))
+    assert custom.encode() == b'custom'
+    assert Custom.decode(b'\x08\x03') == ({'amount': 3}, b'')
+
+
+def test_encoded_size(sample_msgs):
+    for msg in sample_msgs:
+        assert msg.encoded_size() == len(msg.encode())
+        assert msg.encoded_size(1) == len(msg.encode(1))
+
+
+def test_encode_cache(sample_msgs, address):
+    send = sample_msgs[0]
+    encoded = send.encode(1)
+    assert send._encoded is not None
+    assert send.encode(1) == encoded
+    assert Send.decode(send.encode()) == (send, b'')
+    send['inputs'][0]['coins'][1]['amount'] = VarInt(8)
+    assert send._encoded is None
+    assert send.encode(1) != encoded
+    assert send.encode(1) == copy.deepcopy(send).encode(1)
+    send['outputs'].append(Output(address, [Token(1, 'BNB')]))
+    assert send._encoded is None
+    assert Send.decode(send.encode()) == (send, b'')
+    assert pickle.loads(pickle.dumps(send)) == send
+
+
+def test_encode_cache_forgets_parents(sample_msgs):
+    order = sample_msgs[10]
+    for _ in range(100):
+        Repeated([order]).encode(1)
+    assert len(order._parents) == 1
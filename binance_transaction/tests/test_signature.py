@@ -1,7 +1,9 @@
 import base64
 
-from binance_transaction.signature import PubKeySecp256k1
+from binance_transaction.signature import BnbSignature, PubKeySecp256k1
 from binance_transaction.base import Bytes
+from binance_transaction.crypto import public_key_address, public_key_addresses, public_key_hash, uncompress_key
+from binance_transaction.ripemd160 import python_ripemd160
 
 
 def test_pubkey_encoding():
@@ -13,3 +15,21 @@ def test_pubkey_encoding():
     decoded, remaining = PubKeySecp256k1.decode(encoded)
     assert decoded == amino_pubkey
     assert remaining == b''
+
+
+def test_public_key_address(address):
+    public_key = bytes.fromhex('0217067B36F33C1178D09DFB7B8B59853EDC871A7044F2F7DDAD885DDFB353152D')
+    assert public_key_hash(public_key) == bytes.fromhex('BC44784B0C99AA301DAC66C8A477354E039FDB13')
+    assert public_key_address(public_key) == address
+    assert public_key_address(uncompress_key(public_key)) == address
+    assert public_key_addresses([public_key, uncompress_key(public_key)], 'tbnb') == [
+        'tbnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcnysrywd'
+    ] * 2
+    signature = BnbSignature(base64.b64encode(public_key).decode('utf8'), '', 1, 2)
+    assert signature.signer() == address
+
+
+def test_ripemd160():
+    assert python_ripemd160(b'').hex() == '9c1185a5c5e9fc54612808977ee8f548b2258d31'
+    assert python_ripemd160(b'abc').hex() == '8eb208f7e05d987a9b044a8e98c6b087f15a0bfc'
+    assert python_ripemd160(b'message digest').hex() == '5d0689ef49d2fae572b881b123a85ffa21595f36'
@@ -1,7 +1,12 @@
 import base64
 import hashlib
+import pytest
 
+from binance_transaction.base import Input, Output, Repeated, String, Token, VarInt, make_prefix
 from binance_transaction.bnb_transaction import BnbTransaction, TestBnbTransaction
+from binance_transaction.exceptions import AminoDecodeError, UnsupportedBnbMessage
+from binance_transaction.msg import Msg
+from binance_transaction.token import Send
 from binance_transaction.crypto import uncompress_key, verify_sig
 
 
@@ -56,6 +61,7 @@ def test_send_signed_encoding():
     valid_public_key = bytes.fromhex('0217067b36f33c1178d09dfb7b8b59853edc871a7044f2f7ddad885ddfb353152d')
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -95,6 +101,7 @@ def test_issue_signed_encoding():
     valid_public_key = bytes.fromhex('02eb7a82c12680c8762713aabc47bacecc2411b49b7150cf21e2aa9dd162177201')
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     assert valid_tx_hash == tx.hash()
     tx.remove_sig()
     print(tx.signing_json())
@@ -175,6 +182,7 @@ def test_testnet_issue_asset_encoding():
     print(valid_tx)
     print(tx.encode())
     assert valid_tx == tx.encode()
+    assert TestBnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig)
 
@@ -210,6 +218,7 @@ def test_recent_issue_asset_encoding():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig)
 
@@ -245,6 +254,7 @@ def test_recent_testnet_issue_encoding():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert TestBnbTransaction.decode(valid_tx) == (tx, b'')
     assert valid_tx_hash == tx.hash()
     tx.remove_sig()
     print(tx.signing_json())
@@ -316,6 +326,7 @@ def test_burn():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -351,6 +362,7 @@ def test_freeze():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -386,6 +398,7 @@ def test_unfreeze():
     })
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -430,6 +443,7 @@ def test_timelock_encoding():
     )
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -466,6 +480,7 @@ def test_timeunlock_encoding():
     )
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert BnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
@@ -515,6 +530,57 @@ def test_timerelock_encoding():
     )
     tx.apply_sig(valid_sig, uncompress_key(valid_public_key))
     assert valid_tx == tx.encode()
+    assert TestBnbTransaction.decode(valid_tx) == (tx, b'')
     tx.remove_sig()
     print(tx.signing_json())
     assert verify_sig(uncompress_key(valid_public_key), tx.signing_hash(), valid_sig), 'Wrong json encoding'
+
+
+def test_send_many_outputs_encoding():
+    address = 'bnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcn292qwu'
+    outputs = Repeated([Output(address, [Token(i + 1, 'BNB')]) for i in range(100)])
+    send = Send(Repeated([Input(address, [Token(5050, 'BNB')])]), outputs)
+    body = send.encode()
+    assert body.startswith(send.object_id() + Input(address, [Token(5050, 'BNB')]).encode(1))
+    assert body.endswith(b''.join(output.encode(2) for output in outputs))
+    assert send.encode(1) == make_prefix(1, 2) + VarInt(len(body)).encode() + body
+    assert Send.decode(body) == (send, b'')
+    tx = BnbTransaction(1, 2)
+    tx.add_msg(send)
+    encoded = tx.encode()
+    assert tx.encoded_size() == len(encoded)
+    length, remaining = VarInt.decode(encoded)
+    assert length == len(remaining)
+    assert remaining == tx.object_id() + send.encode(1) + VarInt(887).encode(4)
+
+
+def test_truncated_decoding():
+    tx = BnbTransaction(1, 2)
+    tx.add_msg(Send(
+        Repeated([Input('bnb1h3z8sjcvnx4rq8dvvmy2gae4fcpelkcn292qwu', [Token(1, 'BNB')])]),
+        Repeated([Output('bnb136ns6lfw4zs5hg4n85vdthaad7hq5m4gtkgf23', [Token(1, 'BNB')])])
+    ))
+    encoded = tx.encode()
+    for length in range(len(encoded)):
+        with pytest.raises(AminoDecodeError):
+            BnbTransaction.decode(encoded[:length])
+
+
+def test_truncated_message_body():
+    object_id = Send.object_id()
+    for length in range(4):
+        with pytest.raises(AminoDecodeError):
+            Msg.decode(make_prefix(1, 2) + bytes([length]) + object_id[:length] + object_id, 1)
+    with pytest.raises(UnsupportedBnbMessage):
+        Msg.decode(make_prefix(1, 2) + b'\x04\x00\x00\x00\x00', 1)
+
+
+def test_invalid_utf8():
+    for data in [b'\x01\xff', b'\x02\xc3\x28', b'\x03BN\xe2']:
+        with pytest.raises(AminoDecodeError):
+            String.decode(data)
+        with pytest.raises(AminoDecodeError):
+            String.read_raw(memoryview(data), 0, len(data))
+    encoded = Token(5, 'BNB').encode()
+    with pytest.raises(AminoDecodeError):
+        Token.decode(encoded.replace(b'BNB', b'B\xffB'))
@@ -0,0 +1,49 @@
+import pytest
+
+from binance_transaction.base import VarInt
+from binance_transaction.exceptions import AminoDecodeError
+from binance_transaction.varint import (
+    decode_varints, encode_varints, read_varint, varint_bytes, varint_size, write_varint
+)
+
+
+VALUES = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 21 - 1, 2 ** 21, 10 ** 8, 500000000, 8999999999999999999, 2 ** 64 - 1]
+
+
+def reference(value):
+    int_bytes = []
+    while value >= 128:
+        int_bytes.append(value % 128 + 128)
+        value //= 128
+    int_bytes.append(value)
+    return bytes(int_bytes)
+
+
+def test_varint_bytes():
+    for value in VALUES + list(range(0, 1 << 15, 7)):
+        assert varint_bytes(value) == reference(value)
+        assert varint_size(value) == len(reference(value))
+        assert read_varint(reference(value), 0, len(reference(value))) == (value, len(reference(value)))
+
+
+def test_batch():
+    encoded = encode_varints(VALUES)
+    assert encoded == b''.join(reference(value) for value in VALUES)
+    assert decode_varints(encoded) == VALUES
+    assert decode_varints(b'\x00' + encoded + b'\x00', 1, len(encoded) + 1) == VALUES
+    with pytest.raises(AminoDecodeError):
+        decode_varints(encoded[:-1])
+
+
+def test_negative():
+    for value in [-1, -127, -16384, -2 ** 63]:
+        with pytest.raises(ValueError):
+            varint_bytes(value)
+        with pytest.raises(ValueError):
+            write_varint(bytearray(), value)
+        with pytest.raises(ValueError):
+            encode_varints([1, value])
+        with pytest.raises(ValueError):
+            VarInt(value).encode()
+        with pytest.raises(ValueError):
+            VarInt(value).encode(1)
@@ -0,0 +1,64 @@
+import base64
+import hashlib
+
+from ecdsa import SigningKey
+from ecdsa.curves import SECP256k1
+
+from binance_transaction.base import Bytes
+from binance_transaction.bnb_transaction import BnbTransaction
+from binance_transaction.crypto import public_key_address, verify_sig
+from binance_transaction.verify import verify_transactions
+
+
+def test_sign(signed_orders):
+    signing_key = SigningKey.from_secret_exponent(987654321, curve=SECP256k1)
+    public_key = b'\x04' + signing_key.get_verifying_key().to_string()
+    for tx in signed_orders(20):
+        expected = BnbTransaction(1, tx['sequence'])
+        expected.add_msg(tx['msgs'][0])
+        expected.apply_sig(signing_key.sign_digest_deterministic(expected.signing_hash(), hashfunc=hashlib.sha256),
+                           public_key)
+        assert tx.encode() == expected.encode()
+        assert tx.signers() == [public_key_address(public_key)]
+        expected.remove_sig()
+        assert expected.sign(signing_key).encode() == tx.encode()
+        assert verify_sig(public_key, tx.signing_hash(), base64.b64decode(str(tx['signatures'][0]['signature'])))
+
+
+def test_signing_template(signed_orders):
+    txs = signed_orders(3)
+    template = txs[0].signing_template()
+    txs[1]['memo'] = 'other'
+    txs[2]['account_number'] = 1
+    assert [template.matches(tx) for tx in txs] == [True, False, False]
+    for tx in txs:
+        assert template.signing_hash(tx) == tx.signing_hash()
+        assert tx.signing_json() == tx.signing_prefix() + tx.signing_suffix()
+
+
+def test_verify_transactions(signed_orders):
+    txs = signed_orders(6)
+    txs[2]['memo'] = 'tampered'
+    txs[4].remove_sig()
+    expected = [True, True, False, True, False, True]
+    assert verify_transactions(txs, workers=1) == expected
+    assert verify_transactions(txs, workers=2, min_pool_jobs=0) == expected
+
+
+def test_verify_malformed_keys(signed_orders):
+    txs = signed_orders(5)
+    txs[1]['signatures'][0]['pub_key']['pub_key'] = Bytes(base64.b64encode(b'\x02' + b'\xff' * 32).decode('utf8'))
+    txs[2]['signatures'][0]['pub_key']['pub_key'] = Bytes(base64.b64encode(b'\x04' + b'\x01' * 64).decode('utf8'))
+    txs[3]['signatures'][0]['signature'] = Bytes(base64.b64encode(b'\x01' * 63).decode('utf8'))
+    txs[4]['signatures'][0]['pub_key']['pub_key'] = Bytes('AAE')
+    expected = [True, False, False, False, False]
+    assert verify_transactions(txs, workers=1) == expected
+    assert verify_transactions(txs, workers=2, min_pool_jobs=0) == expected
+
+
+def test_verify_decoded_transactions(signed_orders):
+    encoded = [tx.encode() for tx in signed_orders(2)]
+    decoded = [BnbTransaction.decode(data)[0] for data in encoded]
+    records = [BnbTransaction.decode_compact(data) for data in encoded]
+    lazy = [BnbTransaction.decode_lazy(data) for data in encoded]
+    assert verify_transactions(decoded + records + lazy, workers=1) == [True] * 6
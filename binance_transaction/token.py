@@ -1,4 +1,5 @@
-from binance_transaction.base import Address, Amino, Bool, Input, Output, Repeated, String, Token, VarInt, make_prefix
+from binance_transaction.base import Address, Amino, Bool, Input, Output, Repeated, String, Token, VarInt, as_repeated
+from binance_transaction.schema import Field
 
 
 """
@@ -20,36 +21,18 @@ Their message type usually starts with tokens/*
 
 
 class Send(Amino):
+    fields = (
+        Field(1, 'inputs', Input, repeated=True),
+        Field(2, 'outputs', Output, repeated=True),
+    )
+
     def __init__(self, inputs, outputs):
-        dict.__init__(self, inputs=inputs, outputs=outputs)
+        dict.__init__(self, inputs=as_repeated(inputs), outputs=as_repeated(outputs))
 
     @staticmethod
     def object_id():
         return bytes.fromhex('2A2C87FA')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['inputs'].encode(1)
-        buf += self['outputs'].encode(2)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    @staticmethod
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        assert data[0:4] == Send.object_id()
-        data = data[4:]
-        inputs, data = Repeated.decode(data, bytes([8 | 2]), Input)
-        outputs, data = Repeated.decode(data, bytes([16 | 2]), Output)
-        return Send(inputs, outputs), data
-
     @staticmethod
     def from_msg_obj(send_data):
         inputs = Repeated([])
@@ -68,6 +51,14 @@ class Send(Amino):
 
 
 class Issue(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'name', String),
+        Field(3, 'symbol', String),
+        Field(4, 'total_supply', VarInt),
+        Field(5, 'mintable', Bool),
+    )
+
     def __init__(self, from_address, name, symbol, total_supply, mintable):
         dict.__init__(
             self,
@@ -81,35 +72,6 @@ class Issue(Amino):
     def object_id():
         return bytes.fromhex('17EFAB80')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['name'].encode(2)
-        buf += self['symbol'].encode(3)
-        buf += self['total_supply'].encode(4)
-        buf += Bool(self['mintable']).encode(5)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(data, field_id=None, hrp='bnb'):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        assert data[0:4] == Issue.object_id()
-        data = data[4:]
-        address, data = Address.decode(data, 1, hrp)
-        name, data = String.decode(data, 2)
-        symbol, data = String.decode(data, 3)
-        total_supply, data = VarInt.decode(data, 4)
-        mintable, data = Bool.decode(data, 5)
-        mintable = True if mintable else 0
-        return Issue(address, name, symbol, total_supply, mintable), data
-
     @staticmethod
     def from_msg_obj(issue_data):
         return Issue(
@@ -122,6 +84,12 @@ class Issue(Amino):
 
 
 class Mint(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'symbol', String),
+        Field(3, 'amount', VarInt),
+    )
+
     def __init__(self, from_address, symbol, amount):
         dict.__init__(
             self,
@@ -134,28 +102,6 @@ class Mint(Amino):
     def object_id():
         return bytes.fromhex('467E0829')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['symbol'].encode(2)
-        buf += self['amount'].encode(3)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        from_address, data = Address.decode(data, 1)
-        symbol, data = String.decode(data, 2)
-        amount, data = VarInt.decode(data, 3)
-        return Mint(from_address, symbol, amount)
-
     @staticmethod
     def from_msg_obj(mint_data):
         return Mint(
@@ -166,6 +112,12 @@ class Mint(Amino):
 
 
 class Burn(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'symbol', String),
+        Field(3, 'amount', VarInt),
+    )
+
     def __init__(self, from_address, symbol, amount):
         dict.__init__(
             self,
@@ -178,30 +130,6 @@ class Burn(Amino):
     def object_id():
         return bytes.fromhex('7ED2D2A0')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['symbol'].encode(2)
-        buf += self['amount'].encode(3)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    def decode(data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        assert data[0:4] == Burn.object_id()
-        data = data[4:]
-        from_address, data = Address.decode(data, 1)
-        symbol, data = String.decode(data, 2)
-        amount, data = VarInt.decode(data, 3)
-        return Burn(from_address, symbol, amount), data
-
     @staticmethod
     def from_msg_obj(burn_data):
         return Burn(
@@ -212,6 +140,12 @@ class Burn(Amino):
 
 
 class Freeze(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'symbol', String),
+        Field(3, 'amount', VarInt),
+    )
+
     def __init__(self, from_address, symbol, amount):
         dict.__init__(
             self,
@@ -224,31 +158,6 @@ class Freeze(Amino):
     def object_id():
         return bytes.fromhex('E774B32D')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += Address(self['from']).encode(1)
-        buf += String(self['symbol']).encode(2)
-        buf += VarInt(self['amount']).encode(3)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
-    @classmethod
-    def decode(klass, data, field_id=None):
-        if field_id is not None:
-            prefix = make_prefix(field_id, 2)
-            for i in range(len(prefix)):
-                if prefix[i] != data[i]:
-                    return None, data
-            data = data[len(field_id):]
-        assert data[0:4] == klass.object_id()
-        data = data[4:]
-        from_address, data = Address.decode(data, 1)
-        symbol, data = String.decode(data, 2)
-        amount, data = VarInt.decode(data, 3)
-        return klass(from_address, symbol, amount), data
-
     @classmethod
     def from_msg_obj(klass, freeze_data):
         return klass(
@@ -265,6 +174,13 @@ class Unfreeze(Freeze):
 
 
 class TimeLock(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'description', String),
+        Field(3, 'amount', Token, repeated=True),
+        Field(4, 'lock_time', VarInt),
+    )
+
     def __init__(self, from_address, description, amount, lock_time):
         dict.__init__(
             self,
@@ -278,17 +194,6 @@ class TimeLock(Amino):
     def object_id():
         return bytes.fromhex('07921531')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['description'].encode(2)
-        buf += self['amount'].encode(3)
-        buf += self['lock_time'].encode(4)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
     @staticmethod
     def from_msg_obj(timelock_data):
         coins = []
@@ -303,6 +208,11 @@ class TimeLock(Amino):
 
 
 class TimeUnlock(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'time_lock_id', VarInt),
+    )
+
     def __init__(self, from_address, time_lock_id):
         dict.__init__(
             self,
@@ -314,15 +224,6 @@ class TimeUnlock(Amino):
     def object_id():
         return bytes.fromhex('C4050C6C')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['time_lock_id'].encode(2)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
     @staticmethod
     def from_msg_obj(timeunlock_data):
         return TimeUnlock(
@@ -332,6 +233,14 @@ class TimeUnlock(Amino):
 
 
 class TimeRelock(Amino):
+    fields = (
+        Field(1, 'from', Address),
+        Field(2, 'time_lock_id', VarInt),
+        Field(3, 'description', String),
+        Field(4, 'amount', Token, repeated=True),
+        Field(5, 'lock_time', VarInt),
+    )
+
     def __init__(self, from_address, time_lock_id, description, amount, lock_time):
         dict.__init__(
             self,
@@ -346,18 +255,6 @@ class TimeRelock(Amino):
     def object_id():
         return bytes.fromhex('504711DA')
 
-    def encode(self, field_id=None):
-        buf = self.object_id()
-        buf += self['from'].encode(1)
-        buf += self['time_lock_id'].encode(2)
-        buf += self['description'].encode(3)
-        buf += self['amount'].encode(4)
-        buf += self['lock_time'].encode(5)
-        if field_id is None:
-            return buf
-        else:
-            return make_prefix(field_id, 2) + VarInt(len(buf)).encode() + buf
-
     @staticmethod
     def from_msg_obj(timerelock_data):
         amounts = []
@@ -0,0 +1,119 @@
+from binance_transaction.exceptions import AminoDecodeError
+
+
+"""
+varint.py
+
+Table-driven base 128 VarInt codec
+https://developers.google.com/protocol-buffers/docs/encoding#varints
+
+Values below 2 ** 14 (field prefixes, lengths, sides, small ids) are looked up whole
+Larger values such as 1e8-scaled amounts are written 14 bits per table lookup
+Negative values raise ValueError rather than indexing the tables from the end
+
+* varint_bytes
+* write_varint
+* varint_size
+* read_varint
+* encode_varints
+* decode_varints
+"""
+
+
+def build_tables():
+    final, continued = [], []
+    for value in range(1 << 14):
+        low, high = value & 127, value >> 7
+        final.append(bytes([low]) if high == 0 else bytes([low | 128, high]))
+        continued.append(bytes([low | 128, high | 128]))
+    return final, continued
+
+
+# FINAL[v] is the complete encoding of v, CONTINUED[v] encodes 14 bits followed by more bytes
+FINAL, CONTINUED = build_tables()
+
+
+def varint_bytes(value):
+    if value < 16384:
+        if value < 0:
+            raise ValueError('Negative VarInt %d' % value)
+        return FINAL[value]
+    buf = bytearray()
+    while value >= 16384:
+        buf += CONTINUED[value & 16383]
+        value >>= 14
+    buf += FINAL[value]
+    return bytes(buf)
+
+
+def write_varint(buf, value):
+    if value < 128:
+        if value < 0:
+            raise ValueError('Negative VarInt %d' % value)
+        buf.append(value)
+        return
+    while value >= 16384:
+        buf += CONTINUED[value & 16383]
+        value >>= 14
+    buf += FINAL[value]
+
+
+def varint_size(value):
+    return (value.bit_length() + 6) // 7 or 1
+
+
+def read_varint(data, pos, end):
+    """
+    Returns the VarInt at data[pos] and the offset following it
+    """
+    if pos < end and data[pos] < 128:
+        return data[pos], pos + 1
+    value = 0
+    shift = 0
+    while pos < end:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 127) << shift
+        if byte < 128:
+            return value, pos
+        shift += 7
+        if shift > 63:
+            raise AminoDecodeError('VarInt longer than 10 bytes ending at offset %d' % pos)
+    raise AminoDecodeError('Reached end while parsing VarInt at offset %d' % pos)
+
+
+def encode_varints(values):
+    """
+    Concatenated encodings of a sequence of ints, as in a packed repeated field
+    """
+    buf = bytearray()
+    for value in values:
+        if value < 16384:
+            if value < 0:
+                raise ValueError('Negative VarInt %d' % value)
+            buf += FINAL[value]
+            continue
+        while value >= 16384:
+            buf += CONTINUED[value & 16383]
+            value >>= 14
+        buf += FINAL[value]
+    return bytes(buf)
+
+
+def decode_varints(data, pos=0, end=None):
+    """
+    Decode every VarInt in data[pos:end]
+    """
+    if end is None:
+        end = len(data)
+    values = []
+    append = values.append
+    while pos < end:
+        byte = data[pos]
+        if byte < 128:
+            append(byte)
+            pos += 1
+            continue
+        value, pos = read_varint(data, pos, end)
+        append(value)
+    return values
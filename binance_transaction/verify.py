@@ -0,0 +1,81 @@
+from binance_transaction.crypto import verify_sig
+
+from concurrent.futures import ProcessPoolExecutor
+import base64
+import hashlib
+import os
+
+
+"""
+verify.py
+
+Batch signature verification over a process pool
+ecdsa is pure Python, so verification only scales across processes
+Each worker keeps its own cache of prepared verifying keys, see crypto.verifying_key
+
+* verify_transactions
+"""
+
+
+# below this many signatures, starting processes costs more than it saves
+MIN_POOL_JOBS = 64
+# chunks per worker, to balance the load without paying for a round trip per signature
+CHUNKS_PER_WORKER = 4
+
+
+def signature_jobs(tx):
+    """
+    (base64 public key, signing hash, base64 signature) for each signature on tx
+    They are decoded in verify_job, so that a malformed one only fails its own transaction
+    """
+    digest = hashlib.sha256(tx.signing_json()).digest()
+    return [
+        (str(signature['pub_key']['pub_key']), digest, str(signature['signature']))
+        for signature in tx['signatures']
+    ]
+
+
+def verify_job(public_key, digest, signature):
+    """
+    False rather than an exception for keys and signatures that do not decode
+    Backends return False themselves for keys off the curve and malformed signatures
+    """
+    try:
+        public_key, signature = base64.b64decode(public_key), base64.b64decode(signature)
+    except ValueError:
+        # binascii.Error
+        return False
+    return verify_sig(public_key, digest, signature)
+
+
+def verify_chunk(jobs):
+    return [verify_job(public_key, digest, signature) for public_key, digest, signature in jobs]
+
+
+def verify_transactions(txs, workers=None, executor=None, min_pool_jobs=MIN_POOL_JOBS):
+    """
+    Check every signature of each transaction against its signing hash
+    Returns a bool for each transaction, in order, which is False for unsigned transactions
+    workers defaults to the number of CPUs, and executor may be a pool to reuse across calls
+    """
+    jobs_by_tx = [signature_jobs(tx) for tx in txs]
+    jobs = [job for tx_jobs in jobs_by_tx for job in tx_jobs]
+    workers = workers or os.cpu_count() or 1
+    if executor is None and (workers == 1 or len(jobs) < min_pool_jobs):
+        results = verify_chunk(jobs)
+    else:
+        size = max(1, -(-len(jobs) // (workers * CHUNKS_PER_WORKER)))
+        chunks = [jobs[start:start + size] for start in range(0, len(jobs), size)]
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                verified = list(pool.map(verify_chunk, chunks))
+        else:
+            verified = list(executor.map(verify_chunk, chunks))
+        results = [result for chunk in verified for result in chunk]
+    valid = []
+    position = 0
+    for tx_jobs in jobs_by_tx:
+        tx_results = results[position:position + len(tx_jobs)]
+        position += len(tx_jobs)
+        valid.append(len(tx_results) > 0 and all(tx_results))
+    return valid
@@ -0,0 +1,98 @@
+from binance_transaction.exceptions import AminoDecodeError
+from binance_transaction.varint import read_varint, write_varint
+
+
+"""
+wire.py
+
+Low-level amino wire format helpers
+VarInts themselves are in varint.py
+Encoders append to a shared bytearray
+Decoders walk a memoryview with an integer offset
+
+* begin_message
+* end_message
+* write_message
+* read_length
+* read_string
+* read_object_id
+* read_field
+* check_end
+"""
+
+
+def begin_message(buf, field_id=None):
+    """
+    Write the field prefix and reserve a single byte for the length
+    Returns the offset of the reserved byte, to be passed to end_message
+    """
+    if field_id is not None:
+        write_varint(buf, field_id << 3 | 2)
+    buf.append(0)
+    return len(buf) - 1
+
+
+def end_message(buf, offset):
+    """
+    Back-patch the length reserved by begin_message
+    Only lengths of 128 or more need to shift the message body
+    """
+    length = len(buf) - offset - 1
+    if length < 128:
+        buf[offset] = length
+    else:
+        prefix = bytearray()
+        write_varint(prefix, length)
+        buf[offset:offset + 1] = prefix
+
+
+def write_message(buf, body, field_id=None):
+    """
+    Write an already encoded message body, as begin_message and end_message would have framed it
+    """
+    if field_id is not None:
+        write_varint(buf, field_id << 3 | 2)
+    write_varint(buf, len(body))
+    buf += body
+
+
+def read_length(data, pos, end):
+    """
+    Returns the bounds of the length-prefixed value at data[pos]
+    """
+    length, pos = read_varint(data, pos, end)
+    if pos + length > end:
+        raise AminoDecodeError('Length %d at offset %d overruns the end at %d' % (length, pos, end))
+    return pos, pos + length
+
+
+def read_string(data, pos, end):
+    """
+    Returns the length-prefixed UTF-8 string at data[pos] and the offset following it
+    """
+    start, pos = read_length(data, pos, end)
+    try:
+        return str(data[start:pos], 'utf8'), pos
+    except UnicodeDecodeError as e:
+        raise AminoDecodeError('Invalid UTF-8 at offset %d' % (start + e.start))
+
+
+def read_object_id(data, pos, end, object_id):
+    if pos + 4 > end or data[pos:pos + 4] != object_id:
+        raise AminoDecodeError('Expected object id %s at offset %d' % (object_id.hex().upper(), pos))
+    return pos + 4
+
+
+def read_field(klass, data, pos, end, field_id, hrp='bnb'):
+    """
+    Returns the value of field_id at data[pos] and the offset following it
+    Amino omits default values, so an absent field decodes as klass.default()
+    """
+    if pos < end and data[pos] == field_id << 3 | klass.wire_type:
+        return klass.read(data, pos + 1, end, hrp)
+    return klass.default(), pos
+
+
+def check_end(pos, end):
+    if pos != end:
+        raise AminoDecodeError('Unexpected field at offset %d' % pos)
@@ -10,6 +10,7 @@ setuptools.setup(
     author_email="wjmelements@gmail.com",
     description="Binance Chain Transactions",
     install_requires=['ecdsa'],
+    extras_require={'numpy': ['numpy'], 'coincurve': ['coincurve']},
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/trusttoken/bnb-tx-python",